@@ -0,0 +1,159 @@
+"""
+Latency, throughput and memory of the main API endpoints on a large dataset.
+
+Runs the app in-process with the Flask test client against a database made
+by generate_dataset.py, signed in as user1 (the most active user). Each
+scenario is warmed up, then timed request by request for p50/p95/p99 and
+requests per second; peak Python memory per request is measured with
+tracemalloc on a separate, shorter pass so tracing does not skew the
+timings. Response caches are off unless --cache is given, so the numbers
+reflect the queries and serialization.
+
+Run from the backend directory:
+    python benchmarks/generate_dataset.py /tmp/bench.db --scale 0.1
+    python benchmarks/bench_endpoints.py /tmp/bench.db [--requests 200] [--cache]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select
+from config import Config
+from flaskr import create_app
+from flaskr.db import db
+from flaskr.models.post_model import PostModel
+from generate_dataset import DEFAULT_PASSWORD
+
+API = "/api/v1"
+EMAIL = "user1@example.com"
+# Pages walked before a paginated scenario starts again from the top
+MAX_PAGES = 50
+
+
+class Pager:
+    """Follows nextCursor through a paginated listing"""
+
+    def __init__(self, path):
+        self.path = path
+        self.cursor = None
+        self.pages = 0
+
+    def __call__(self, client, headers):
+        query = {"limit": 20}
+        if self.cursor:
+            query["cursor"] = self.cursor
+        response = client.get(self.path, query_string=query, headers=headers)
+        self.pages += 1
+        self.cursor = response.json.get("nextCursor") if response.status_code == 200 else None
+        if self.pages >= MAX_PAGES:
+            self.cursor, self.pages = None, 0
+        return response
+
+
+def scenarios(post_count, seed):
+    rng = random.Random(seed)
+
+    def get(path):
+        return lambda client, headers: client.get(path, headers=headers)
+
+    def reviews(client, headers):
+        return client.get(f"{API}/posts/{rng.randint(1, post_count)}/reviews", headers=headers)
+
+    def sign_in(client, headers):
+        return client.post(f"{API}/auth/sign-in", json={"email": EMAIL, "password": DEFAULT_PASSWORD})
+
+    # name, request, share of --requests (password hashing is slow by design)
+    return [
+        ("GET /posts?limit=20", Pager(f"{API}/posts"), 1),
+        ("GET /posts/user?limit=20", Pager(f"{API}/posts/user"), 1),
+        ("GET /favorites", get(f"{API}/favorites"), 1),
+        ("GET /posts/<id>/reviews", reviews, 1),
+        ("GET /tasks", get(f"{API}/tasks"), 1),
+        ("POST /auth/sign-in", sign_in, 0.1),
+    ]
+
+
+def percentile(samples, pct):
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def run(client, headers, request, count, warmup):
+    for _ in range(warmup):
+        request(client, headers)
+
+    samples = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(count):
+        start = time.perf_counter()
+        response = request(client, headers)
+        samples.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            errors += 1
+    elapsed = time.perf_counter() - started
+    return samples, count / elapsed, errors
+
+
+def peak_memory(client, headers, request, count):
+    peaks = []
+    tracemalloc.start()
+    for _ in range(count):
+        tracemalloc.reset_peak()
+        request(client, headers)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    return max(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="database made by generate_dataset.py")
+    parser.add_argument("--requests", type=int, default=200, help="timed requests per scenario")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--memory-requests", type=int, default=10)
+    parser.add_argument("--cache", action="store_true", help="keep the feed and map caches on")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        parser.error(f"{args.path} does not exist")
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.abspath(args.path)
+        JWT_SECRET_KEY = Config.JWT_SECRET_KEY or "benchmark-secret-key-of-32-bytes"
+        QUERY_STATS_ENABLED = False
+        IMAGE_WORKERS = 0
+        if not args.cache:
+            FEED_CACHE_MAX_ENTRIES = 0
+            MAP_CACHE_MAX_ENTRIES = 0
+
+    app = create_app(BenchConfig)
+    client = app.test_client()
+    with app.app_context():
+        post_count = db.session.execute(select(func.count()).select_from(PostModel)).scalar()
+
+    response = client.post(f"{API}/auth/sign-in", json={"email": EMAIL, "password": DEFAULT_PASSWORD})
+    if response.status_code != 200:
+        sys.exit(f"Sign-in as {EMAIL} failed ({response.status_code}); was the database made by generate_dataset.py?")
+    headers = {"Authorization": f"Bearer {response.json['token']}"}
+
+    print(f"{post_count} posts, caches {'on' if args.cache else 'off'}, {args.requests} requests per scenario\n")
+    print(f"{'scenario':28} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'peak KiB':>9} {'errors':>7}")
+    for name, request, share in scenarios(post_count, args.seed):
+        count = max(2, int(args.requests * share))
+        samples, throughput, errors = run(client, headers, request, count, min(args.warmup, count))
+        peak = peak_memory(client, headers, request, max(1, min(args.memory_requests, count)))
+        print(
+            f"{name:28} {percentile(samples, 50):8.2f} {percentile(samples, 95):8.2f} "
+            f"{percentile(samples, 99):8.2f} {throughput:8.1f} {peak / 1024:9.0f} {errors:7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
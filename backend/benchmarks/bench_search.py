@@ -0,0 +1,130 @@
+"""
+Benchmark the posts FTS5 index against a LIKE scan on a synthetic dataset.
+
+Builds a throwaway SQLite database with `rows` posts (1M by default),
+indexes it with the same DDL the app uses and times ranked, snippeted
+top-20 queries.
+
+Run from the backend directory:
+    python benchmarks/bench_search.py [rows]
+"""
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flaskr.search import CONTENT_WEIGHT, FTS_DDL, SNIPPET_TOKENS, TITLE_WEIGHT
+
+WORDS = (
+    "river mountain beach forest lake ocean waterfall city street building park "
+    "square desert village farm field ranch quiet old hidden sunset view trail "
+    "bridge market garden castle harbour island valley cave church tower museum "
+    "cafe terrace vineyard meadow cliff dune lighthouse canyon spring"
+).split()
+
+QUERIES = ["river", "hidden waterfall", "old castle tower", "vine*", "sunset beach view"]
+
+SYLLABLES = "ka lo mi ra te su no vi pe da ri zo an el or us".split()
+
+
+def build_vocabulary(rng, size=20000):
+    """Place words plus made-up ones, weighted Zipf-like as in real text"""
+    vocabulary = list(WORDS)
+    while len(vocabulary) < size:
+        vocabulary.append("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    cum_weights, total = [], 0.0
+    for rank in range(1, len(vocabulary) + 1):
+        total += 1.0 / rank
+        cum_weights.append(total)
+    return vocabulary, cum_weights
+
+FTS_SQL = f"""
+    SELECT posts.id, posts.title,
+           snippet(posts_fts, -1, '<mark>', '</mark>', '…', {SNIPPET_TOKENS}),
+           bm25(posts_fts, {TITLE_WEIGHT}, {CONTENT_WEIGHT}) AS rank
+    FROM posts_fts JOIN posts ON posts.id = posts_fts.rowid
+    WHERE posts_fts MATCH ?
+    ORDER BY rank LIMIT 20
+"""
+
+LIKE_SQL = """
+    SELECT id, title FROM posts
+    WHERE title LIKE ? OR content LIKE ?
+    ORDER BY created_at DESC LIMIT 20
+"""
+
+
+def generate(conn, rows, rng):
+    conn.execute(
+        "CREATE TABLE posts (id INTEGER PRIMARY KEY, title VARCHAR(100), "
+        "content VARCHAR(1000), created_at DATETIME)"
+    )
+
+    vocabulary, cum_weights = build_vocabulary(rng)
+
+    def words(k):
+        return " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=k))
+
+    def make(i):
+        title = words(3).title()
+        content = words(rng.randint(15, 60))
+        return i, title, content, f"2025-01-01 00:00:{i % 60:02d}"
+
+    batch = 50000
+    for start in range(1, rows + 1, batch):
+        conn.executemany(
+            "INSERT INTO posts VALUES (?, ?, ?, ?)",
+            (make(i) for i in range(start, min(start + batch, rows + 1))),
+        )
+    conn.commit()
+
+
+def timed(conn, sql, params, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+
+        started = time.perf_counter()
+        generate(conn, rows, rng)
+        print(f"Generated {rows} posts in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        for statement in FTS_DDL:
+            conn.execute(statement)
+        conn.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+        conn.execute("INSERT INTO posts_fts(posts_fts) VALUES ('optimize')")
+        conn.commit()
+        print(f"Built FTS5 index in {time.perf_counter() - started:.1f}s\n")
+
+        print(f"{'query':<20}{'fts p50':>10}{'fts p95':>10}{'like p50':>11}")
+        for query in QUERIES:
+            match = " ".join(
+                word if word.endswith("*") else f'"{word}"' for word in query.split()
+            )
+            fts_p50, fts_p95 = timed(conn, FTS_SQL, (match,), repeat=20)
+            pattern = f"%{query.split()[0].rstrip('*')}%"
+            like_p50, _ = timed(conn, LIKE_SQL, (pattern, pattern), repeat=3)
+            print(f"{query:<20}{fts_p50:>8.1f}ms{fts_p95:>8.1f}ms{like_p50:>9.1f}ms")
+
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Compare the marshmallow list serialization with the compiled serializers.
+
+Run from the backend directory:
+    python benchmarks/bench_serialization.py [rows] [repeat]
+"""
+import json
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flaskr.models.post_model import PostStatus
+from flaskr.models.task_model import TaskStatus
+from flaskr.schemas.plain_schema import PlainReviewSchema
+from flaskr.schemas.schema import PostSchema, TaskSchema
+from flaskr.schemas.serializers import (
+    dumps,
+    serialize_feed_post,
+    serialize_review,
+    serialize_task,
+)
+
+
+def make_rows(count):
+    now = datetime(2025, 1, 1)
+    user = SimpleNamespace(username="traveller")
+    posts, reviews, tasks = [], [], []
+    for i in range(count):
+        created_at = now + timedelta(seconds=i)
+        posts.append(SimpleNamespace(
+            id=i, title=f"Place {i}", content="A quiet spot by the river " * 4,
+            status=PostStatus.NATURA, image=f"{i}.jpg", image_variants=None,
+            latitude=41.1 + i * 1e-5,
+            longitude=-8.6, created_at=created_at, updated_at=created_at,
+            user_id=1, username="traveller", tag_name="River",
+        ))
+        reviews.append(SimpleNamespace(
+            id=i, rating=4, comment="Lovely view", user_id=1, user=user, username="traveller",
+            created_at=created_at, updated_at=created_at,
+        ))
+        tasks.append(SimpleNamespace(
+            id=i, title=f"Task {i}", content="Visit", status=TaskStatus.NATURA,
+            created_at=created_at, tag_name="River",
+        ))
+    return posts, reviews, tasks
+
+
+def marshmallow_posts(posts):
+    return json.dumps(PostSchema(many=True).dump(posts), sort_keys=True).encode()
+
+
+def marshmallow_reviews(reviews):
+    schema = PlainReviewSchema()
+    return json.dumps(
+        [{**schema.dump(r), "username": r.user.username} for r in reviews],
+        sort_keys=True,
+    ).encode()
+
+
+def marshmallow_tasks(tasks):
+    return json.dumps(TaskSchema(many=True).dump(tasks), sort_keys=True).encode()
+
+
+def compiled_posts(posts):
+    return dumps([serialize_feed_post(p) for p in posts])
+
+
+def compiled_reviews(reviews):
+    return dumps([serialize_review(r) for r in reviews])
+
+
+def compiled_tasks(tasks):
+    return dumps([serialize_task(t) for t in tasks])
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    posts, reviews, tasks = make_rows(count)
+
+    cases = [
+        ("posts", posts, marshmallow_posts, compiled_posts),
+        ("reviews", reviews, marshmallow_reviews, compiled_reviews),
+        ("tasks", tasks, marshmallow_tasks, compiled_tasks),
+    ]
+
+    print(f"{count} rows, best of {repeat}")
+    print(f"{'list':<10}{'marshmallow':>14}{'compiled':>12}{'speedup':>10}")
+    for name, rows, slow, fast in cases:
+        slow_time = min(timeit.repeat(lambda: slow(rows), number=1, repeat=repeat))
+        fast_time = min(timeit.repeat(lambda: fast(rows), number=1, repeat=repeat))
+        print(
+            f"{name:<10}{slow_time * 1000:>12.1f}ms{fast_time * 1000:>10.1f}ms"
+            f"{slow_time / fast_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
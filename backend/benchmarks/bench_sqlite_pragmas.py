@@ -0,0 +1,126 @@
+"""
+Concurrent read/write throughput of SQLite with the default settings and
+with the SQLITE_PRAGMAS profile from config.py.
+
+Builds a throwaway database with `rows` posts, then runs `readers` threads
+doing feed-style page queries and `writers` threads inserting posts (one
+commit each) for `seconds`, once per profile.
+
+Run from the backend directory:
+    python benchmarks/bench_sqlite_pragmas.py [rows] [seconds] [readers] [writers]
+"""
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from flaskr.db import apply_sqlite_pragmas
+
+SCHEMA = """
+    CREATE TABLE posts (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        user_id INTEGER NOT NULL,
+        created_at TEXT NOT NULL
+    );
+    CREATE INDEX ix_posts_created_at ON posts (created_at);
+"""
+READ = "SELECT id, title, content, user_id, created_at FROM posts ORDER BY created_at DESC LIMIT 20 OFFSET ?"
+WRITE = "INSERT INTO posts (title, content, user_id, created_at) VALUES (?, ?, ?, datetime('now'))"
+
+
+def build(path, rows):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        "INSERT INTO posts (title, content, user_id, created_at) "
+        "VALUES (?, ?, ?, datetime('now', ?))",
+        (
+            (f"Place {i}", "A quiet spot by the river " * 8, i % 100, f"-{i} seconds")
+            for i in range(rows)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def run(path, pragmas, seconds, readers, writers):
+    stop = threading.Event()
+    results = {"read": [], "write": [], "errors": 0}
+    lock = threading.Lock()
+
+    def worker(kind):
+        # Same timeout as the app's default pysqlite connections
+        conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        if pragmas:
+            apply_sqlite_pragmas(conn, pragmas)
+        latencies, errors = [], 0
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                if kind == "read":
+                    conn.execute(READ, (random.randrange(0, 500) * 20,)).fetchall()
+                else:
+                    conn.execute(WRITE, ("New place", "Just found it " * 8, 1))
+                    conn.commit()
+            except sqlite3.OperationalError:
+                errors += 1
+                conn.rollback()
+                continue
+            latencies.append(time.perf_counter() - start)
+        conn.close()
+        with lock:
+            results[kind].extend(latencies)
+            results["errors"] += errors
+
+    threads = [threading.Thread(target=worker, args=("read",)) for _ in range(readers)]
+    threads += [threading.Thread(target=worker, args=("write",)) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def describe(latencies, seconds):
+    if not latencies:
+        return "       0/s         -         -"
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+    return f"{len(latencies) / seconds:8.0f}/s {p50:8.2f}ms {p95:8.2f}ms"
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    writers = int(sys.argv[4]) if len(sys.argv) > 4 else 2
+
+    profiles = [("default", {}), ("SQLITE_PRAGMAS", Config.SQLITE_PRAGMAS)]
+    print(f"{rows} posts, {readers} readers, {writers} writers, {seconds:g}s per profile\n")
+    print(f"{'profile':16}{'':5}{'reads':>10} {'p50':>9} {'p95':>9}   {'writes':>10} {'p50':>9} {'p95':>9}   errors")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, pragmas in profiles:
+            path = os.path.join(tmp, f"{len(pragmas)}.db")
+            build(path, rows)
+            results = run(path, pragmas, seconds, readers, writers)
+            print(
+                f"{name:16}{'':5}{describe(results['read'], seconds)}   "
+                f"{describe(results['write'], seconds)}   {results['errors']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
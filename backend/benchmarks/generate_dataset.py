@@ -0,0 +1,216 @@
+"""
+Generate a large, deterministic synthetic dataset for benchmarking.
+
+Creates a fresh SQLite database at `path` with the app's schema and fills
+it with users, posts (most with coordinates, clustered around cities),
+reviews, favorites, tasks and comments, loaded in one transaction with
+flaskr/bulk.py. The same seed and scale always produce the same rows.
+Derived data (rating aggregates, heatmap cells, search and spatial
+indexes) is brought up to date as well.
+
+Every user's password is DEFAULT_PASSWORD.
+
+Full scale is 100k users, 1M posts, 5M reviews, 5M favorites, 200k tasks
+and 500k comments; use --scale to shrink it, e.g. --scale 0.01.
+
+Run from the backend directory:
+    python benchmarks/generate_dataset.py path/to/bench.db [--scale 1.0] [--seed 42]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from flaskr import create_app
+from flaskr.bulk import bulk_insert, bulk_load
+from flaskr.db import db
+from flaskr.heatmap import rebuild_heatmap
+from flaskr.models.comment_model import CommentModel
+from flaskr.models.favorite_model import FavoriteModel
+from flaskr.models.post_model import PostModel, PostStatus
+from flaskr.models.review_model import ReviewModel
+from flaskr.models.tag_model import TagModel
+from flaskr.models.task_model import TaskModel, TaskStatus
+from flaskr.models.user_model import UserModel
+from flaskr.ratings import reconcile_ratings
+from flaskr.utils import generate_password
+
+DEFAULT_PASSWORD = "password"
+FULL_SCALE = {
+    "users": 100_000,
+    "posts": 1_000_000,
+    "reviews": 5_000_000,
+    "favorites": 5_000_000,
+    "tasks": 200_000,
+    "comments": 500_000,
+}
+TAGS = ["Mountain", "Beach", "City", "Forest", "Desert", "Lake", "River", "Park"]
+CITIES = [
+    (41.15, -8.61), (38.72, -9.14), (40.42, -3.70), (48.86, 2.35), (51.51, -0.13),
+    (52.52, 13.40), (41.90, 12.50), (44.43, 26.10), (46.77, 23.59), (40.71, -74.01),
+    (34.05, -118.24), (-23.55, -46.63), (35.68, 139.69), (-33.87, 151.21), (19.43, -99.13),
+]
+ADJECTIVES = ["Quiet", "Hidden", "Old", "Sunny", "Windy", "Green", "Golden", "Secret", "Wild", "Little"]
+PLACES = ["river bend", "viewpoint", "beach", "trail", "square", "garden", "lake", "waterfall", "market", "cave"]
+SENTENCES = [
+    "Great spot to watch the sunset.",
+    "Gets busy at weekends, go early.",
+    "Bring water, there is no shade.",
+    "Easy to reach by public transport.",
+    "The path is steep but worth it.",
+    "Perfect for a picnic with friends.",
+    "Locals say it is best in spring.",
+    "Parking is limited nearby.",
+]
+START = datetime(2023, 1, 1)
+
+
+def text(rng, sentences):
+    return " ".join(rng.choice(SENTENCES) for _ in range(sentences))
+
+
+def users(count, password_hash):
+    for i in range(1, count + 1):
+        yield {"id": i, "username": f"user{i}", "email": f"user{i}@example.com", "password": password_hash}
+
+
+def posts(rng, count, user_count, tag_count):
+    span = 3 * 365 * 24 * 3600 / max(count, 1)
+    for i in range(1, count + 1):
+        created_at = START + timedelta(seconds=i * span + rng.random() * span)
+        roll = rng.random()
+        if roll < 0.75:
+            lat, lng = rng.choice(CITIES)
+            lat = max(-90.0, min(90.0, rng.gauss(lat, 0.3)))
+            lng = max(-180.0, min(180.0, rng.gauss(lng, 0.3)))
+        elif roll < 0.9:
+            lat, lng = rng.uniform(-60, 70), rng.uniform(-180, 180)
+        else:
+            lat = lng = None
+        yield {
+            "id": i,
+            "title": f"{rng.choice(ADJECTIVES)} {rng.choice(PLACES)} {i}",
+            "content": text(rng, rng.randint(1, 4)),
+            "status": rng.choice(list(PostStatus)),
+            "latitude": lat,
+            "longitude": lng,
+            # A few very active users, a long tail of occasional ones
+            "user_id": int(user_count * rng.random() ** 3) + 1,
+            "tag_id": rng.randint(1, tag_count) if rng.random() < 0.9 else None,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+def reviews(rng, count, user_count, post_count):
+    # Post k % posts gets its (k // posts)-th review from a distinct user
+    for k in range(count):
+        post_id = k % post_count + 1
+        user_id = (post_id * 7919 + k // post_count) % user_count + 1
+        created_at = START + timedelta(minutes=rng.randrange(3 * 365 * 24 * 60))
+        yield {
+            "rating": rng.choices((1, 2, 3, 4, 5), weights=(1, 1, 3, 5, 4))[0],
+            "comment": text(rng, rng.randint(1, 2)),
+            "user_id": user_id,
+            "post_id": post_id,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+def favorites(rng, count, user_count, post_count):
+    # User k % users gets its (k // users)-th favorite on a distinct post
+    for k in range(count):
+        user_id = k % user_count + 1
+        post_id = (user_id * 104729 + k // user_count) % post_count + 1
+        created_at = START + timedelta(minutes=rng.randrange(3 * 365 * 24 * 60))
+        yield {
+            "notes": rng.choice(SENTENCES) if rng.random() < 0.3 else None,
+            "user_id": user_id,
+            "post_id": post_id,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+def tasks(rng, count, user_count, tag_count):
+    for k in range(count):
+        yield {
+            "title": f"Visit {rng.choice(PLACES)} {k}"[:40],
+            "content": text(rng, 2),
+            "status": rng.choice(list(TaskStatus)),
+            "user_id": k % user_count + 1,
+            "tag_id": rng.randint(1, tag_count),
+            "created_at": START + timedelta(minutes=rng.randrange(3 * 365 * 24 * 60)),
+        }
+
+
+def comments(rng, count, user_count, task_count):
+    for _ in range(count):
+        yield {
+            "content": rng.choice(SENTENCES),
+            "user_id": rng.randint(1, user_count),
+            "task_id": rng.randint(1, task_count),
+            "created_at": START + timedelta(minutes=rng.randrange(3 * 365 * 24 * 60)),
+        }
+
+
+def load(connection, model, rows):
+    started = time.perf_counter()
+    total = bulk_insert(connection, model, rows)
+    print(f"  {model.__tablename__:10} {total:>10} rows in {time.perf_counter() - started:6.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="SQLite file to create (must not exist)")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if os.path.exists(args.path):
+        parser.error(f"{args.path} already exists")
+
+    counts = {name: max(1, int(full * args.scale)) for name, full in FULL_SCALE.items()}
+    # Reviews and favorites need enough distinct (user, post) pairs
+    pairs = counts["users"] * counts["posts"]
+    counts["reviews"] = min(counts["reviews"], pairs)
+    counts["favorites"] = min(counts["favorites"], pairs)
+
+    class DatasetConfig(Config):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.abspath(args.path)
+        JWT_SECRET_KEY = Config.JWT_SECRET_KEY or "benchmark"
+        QUERY_STATS_ENABLED = False
+        IMAGE_WORKERS = 0
+
+    app = create_app(DatasetConfig)
+    rng = random.Random(args.seed)
+
+    print(f"Generating {', '.join(f'{n} {name}' for name, n in counts.items())}")
+    started = time.perf_counter()
+    with app.app_context():
+        db.create_all()
+        with bulk_load() as connection:
+            load(connection, TagModel, ({"id": i, "name": name} for i, name in enumerate(TAGS, 1)))
+            load(connection, UserModel, users(counts["users"], generate_password(DEFAULT_PASSWORD)))
+            load(connection, PostModel, posts(rng, counts["posts"], counts["users"], len(TAGS)))
+            load(connection, ReviewModel, reviews(rng, counts["reviews"], counts["users"], counts["posts"]))
+            load(connection, FavoriteModel, favorites(rng, counts["favorites"], counts["users"], counts["posts"]))
+            load(connection, TaskModel, tasks(rng, counts["tasks"], counts["users"], len(TAGS)))
+            load(connection, CommentModel, comments(rng, counts["comments"], counts["users"], counts["tasks"]))
+
+        step = time.perf_counter()
+        reconcile_ratings(db.session)
+        located = rebuild_heatmap(db.session)
+        print(f"  rating aggregates and heatmap ({located} located posts) in {time.perf_counter() - step:.1f}s")
+
+    print(f"Done in {time.perf_counter() - started:.1f}s: {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Check that the hot list queries are served by their indexes.
+
+Runs EXPLAIN QUERY PLAN for each query and fails (exit code 1) when the
+filtered table is scanned in full or the ORDER BY needs a temporary sort.
+
+Run with: python check_query_plans.py [--fresh]
+    --fresh  check a throwaway database built from the models instead of
+             the configured one (which must be migrated to head)
+"""
+import sys
+from datetime import datetime
+from sqlalchemy import select
+from config import DevelopmentConfig
+from flaskr import create_app
+from flaskr.controllers.comment_controller import CommentController
+from flaskr.controllers.favorite_controller import FavoriteController
+from flaskr.controllers.post_controller import PostController
+from flaskr.controllers.review_controller import ReviewController
+from flaskr.controllers.task_controller import TaskController
+from flaskr.db import db
+from flaskr.models.favorite_model import FavoriteModel
+from flaskr.models.post_model import PostModel
+from flaskr.pagination import encode_cursor, keyset_page
+
+
+def hot_queries():
+    """(description, statement, table, index) for each access path.
+
+    Statements come from the controllers' own query builders, so the check
+    follows the SQL the endpoints actually run.
+    """
+    return [
+        (
+            "posts of a user, newest first",
+            keyset_page(
+                PostController._feed_query().where(PostModel.user_id == 1),
+                PostModel.created_at, PostModel.id, 20, None,
+            ),
+            "posts", "ix_posts_user_id_created_at",
+        ),
+        (
+            "favorites of a user, newest first",
+            FavoriteController._list_query(1)
+            .order_by(FavoriteModel.created_at.desc(), FavoriteModel.id.desc()),
+            "favorites", "ix_favorites_user_id_created_at",
+        ),
+        (
+            "favorites of a user, page after a cursor",
+            keyset_page(
+                FavoriteController._list_query(1),
+                FavoriteModel.created_at, FavoriteModel.id, 20, encode_cursor(datetime(2024, 1, 1), 1),
+            ),
+            "favorites", "ix_favorites_user_id_created_at",
+        ),
+        (
+            "reviews of a post, newest first",
+            ReviewController._list_query(1),
+            "reviews", "ix_reviews_post_id_created_at",
+        ),
+        (
+            "comments of a task, newest first",
+            CommentController._list_query(1),
+            "comments", "ix_comments_task_id_created_at",
+        ),
+        (
+            "tasks of a user",
+            TaskController._list_query(1),
+            "tasks", "ix_tasks_user_id",
+        ),
+        (
+            "posts with a tag",
+            select(PostModel.id).where(PostModel.tag_id == 1),
+            "posts", "ix_posts_tag_id",
+        ),
+    ]
+
+
+def plan_problems(plan, table, index):
+    problems = []
+    for line in plan:
+        if line.startswith(f"SCAN {table}") and index not in line:
+            problems.append(line)
+        if "USE TEMP B-TREE FOR ORDER BY" in line:
+            problems.append(line)
+    if not any(index in line for line in plan):
+        problems.append(f"{index} not used")
+    return problems
+
+
+class FreshConfig(DevelopmentConfig):
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+
+
+def main():
+    fresh = "--fresh" in sys.argv[1:]
+    app = create_app(FreshConfig if fresh else None)
+
+    failed = 0
+    with app.app_context():
+        if fresh:
+            db.create_all()
+
+        connection = db.session.connection()
+        for description, stmt, table, index in hot_queries():
+            sql = str(stmt.compile(connection, compile_kwargs={"literal_binds": True}))
+            plan = [row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+            problems = plan_problems(plan, table, index)
+
+            print(f"{'FAIL' if problems else 'ok':4}  {description}")
+            for line in plan:
+                print(f"        {line}")
+            failed += bool(problems)
+
+    if failed:
+        print(f"\n{failed} queries are not served by their index")
+        sys.exit(1)
+    print("\nAll hot queries use their indexes")
+
+
+if __name__ == "__main__":
+    main()
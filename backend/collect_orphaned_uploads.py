@@ -0,0 +1,41 @@
+"""
+Delete files in UPLOAD_FOLDER that no post refers to any more (replaced or
+deleted post images and their derivatives, abandoned temporary uploads).
+
+Run with: python collect_orphaned_uploads.py [--dry-run] [--max-deletes N]
+"""
+import argparse
+from flaskr import create_app
+from flaskr.db import db
+from flaskr.upload_gc import collect_orphans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be deleted")
+    parser.add_argument("--max-deletes", type=int, help="stop after deleting this many files")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    app = create_app()
+
+    with app.app_context():
+        stats = collect_orphans(
+            db.session,
+            app.config["UPLOAD_FOLDER"],
+            app.config["ALLOWED_EXTENSIONS"],
+            grace_seconds=app.config["UPLOAD_GC_GRACE_SECONDS"],
+            batch_size=args.batch_size,
+            max_deletes=args.max_deletes,
+            dry_run=args.dry_run,
+        )
+
+    verb = "Would delete" if args.dry_run else "Deleted"
+    print(
+        f"Scanned {stats['scanned']} files. {verb} {stats['deleted']} orphans, "
+        f"{stats['bytesReclaimed'] / (1024 * 1024):.1f} MB reclaimed"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,21 @@ class Config(object):
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=4)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Applied to each new SQLite connection, in order (see flaskr/db.py).
+    # WAL lets readers run alongside a writer; NORMAL only syncs at checkpoints.
+    SQLITE_PRAGMAS = {
+        "busy_timeout": 5000,  # ms to wait for a lock instead of failing
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,  # KiB, i.e. 64MB of page cache
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    }
+    # Overrides for the duration of a bulk load (flaskr/bulk.py), restored after
+    SQLITE_BULK_PRAGMAS = {
+        "synchronous": "OFF",
+        "cache_size": -256000,  # KiB
+    }
     API_TITLE = "Rest API"
     API_VERSION = "v1"
     OPENAPI_VERSION = "3.0.2"
@@ -19,11 +34,36 @@ class Config(object):
     OPENAPI_SWAGGER_UI_URL = "https://cdn.jsdelivr.net/npm/swagger-ui-dist/"
     UPLOAD_FOLDER = os.path.join(basedir, "uploads")
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+    MAX_IMAGE_SIZE = 16 * 1024 * 1024  # per uploaded file, checked while streaming
+    # "flask" streams files from the worker; "x-accel-redirect" (nginx, with an
+    # internal location at UPLOAD_ACCEL_PREFIX aliased to UPLOAD_FOLDER) and
+    # "x-sendfile" (Apache/lighttpd) leave the transfer to the front proxy
+    UPLOAD_SERVE_MODE = os.getenv("UPLOAD_SERVE_MODE", "flask")
+    UPLOAD_ACCEL_PREFIX = os.getenv("UPLOAD_ACCEL_PREFIX", "/protected-uploads/")
+    UPLOAD_MAX_AGE = 24 * 3600  # seconds, for files not named by content
+    UPLOAD_GC_GRACE_SECONDS = 3600  # unreferenced files younger than this are kept
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+    IMAGE_DERIVATIVE_WIDTHS = (200, 600, 1200)  # px, never upscaled
+    IMAGE_DERIVATIVE_FORMATS = ("webp", "jpeg")
+    IMAGE_QUALITY = 80
+    IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))  # 0 disables the pipeline
+    IMAGE_MAX_PENDING = int(os.getenv("IMAGE_MAX_PENDING", "64"))  # queued jobs before new ones are skipped
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))  # share of hot-path debug lines kept
+    LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+    QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "1") == "1"  # per-request query counts (flaskr/query_stats.py)
+    QUERY_STATS_HEADERS = False  # add X-DB-Query-Count, X-DB-Time-Ms and Server-Timing
+    QUERY_REPEAT_THRESHOLD = 5  # same statement this often in one request is logged as N+1
+    FEED_CACHE_TTL = int(os.getenv("FEED_CACHE_TTL", "30"))  # seconds
+    FEED_CACHE_MAX_ENTRIES = int(os.getenv("FEED_CACHE_MAX_ENTRIES", "256"))  # 0 disables the cache
+    MAP_CACHE_TTL = int(os.getenv("MAP_CACHE_TTL", "300"))  # seconds
+    MAP_CACHE_MAX_ENTRIES = int(os.getenv("MAP_CACHE_MAX_ENTRIES", "2048"))  # tiles
 
 
 class DevelopmentConfig(Config):
     SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(basedir, "data.db")
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG")
+    QUERY_STATS_HEADERS = True
 
 
 class TestConfig(Config):
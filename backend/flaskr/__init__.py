@@ -1,10 +1,15 @@
 import flaskr.models
+import flaskr.versioning
 import os
 
-from flask import Flask, send_from_directory
+from flask import Flask
 from config import DevelopmentConfig
 from flaskr.extensions import migrate, api, cors, jwt
-from flaskr.db import db
+from flaskr.db import db, init_sqlite_pragmas
+from flaskr.cache import feed_cache, map_cache
+from flaskr.log import init_logging
+from flaskr.query_stats import init_query_stats
+from flaskr.uploads import UploadRequest, serve_upload
 
 from flaskr.routes.auth_route import bp as auth_route
 from flaskr.routes.user_route import bp as user_route
@@ -19,20 +24,27 @@ from flaskr.routes.favorite_route import bp as favorite_route
 
 def create_app(test_config=None):
     app = Flask(__name__)
+    app.request_class = UploadRequest
 
     if test_config is None:
         app.config.from_object(DevelopmentConfig)
     else:
         app.config.from_object(test_config)
 
+    init_logging(app)
+
     # Create uploads directory if it doesn't exist
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
     db.init_app(app)
+    init_sqlite_pragmas(app)
+    init_query_stats(app)
     migrate.init_app(app, db)
     api.init_app(app)
     cors.init_app(app)
     jwt.init_app(app)
+    feed_cache.init_app(app)
+    map_cache.init_app(app)
 
     api.register_blueprint(auth_route, url_prefix="/api/v1")
     api.register_blueprint(user_route, url_prefix="/api/v1")
@@ -47,6 +59,6 @@ def create_app(test_config=None):
     # Route to serve uploaded images
     @app.route('/uploads/<filename>')
     def uploaded_file(filename):
-        return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+        return serve_upload(filename)
 
     return app
@@ -0,0 +1,61 @@
+from contextlib import contextmanager
+from itertools import islice
+from flask import current_app
+from sqlalchemy import insert
+from flaskr.db import apply_sqlite_pragmas, db
+
+CHUNK_SIZE = 10_000
+
+
+@contextmanager
+def bulk_load(fast=True):
+    """Connection for loading many rows in a single transaction.
+
+    Commits when the block exits and rolls everything back on error. With
+    fast=True, SQLITE_BULK_PRAGMAS are applied for the duration of the load
+    (durability is traded for speed; a crash mid-load loses the whole load,
+    which is rolled back anyway) and the previous values restored after the
+    commit. Use with bulk_insert():
+
+        with bulk_load() as connection:
+            bulk_insert(connection, TagModel, rows)
+    """
+    with db.engine.connect() as connection:
+        pragmas = current_app.config.get("SQLITE_BULK_PRAGMAS") if fast else None
+        if connection.dialect.name != "sqlite":
+            pragmas = None
+
+        saved = {}
+        dbapi_connection = connection.connection.dbapi_connection
+        if pragmas:
+            cursor = dbapi_connection.cursor()
+            try:
+                for name in pragmas:
+                    saved[name] = cursor.execute(f"PRAGMA {name}").fetchone()[0]
+            finally:
+                cursor.close()
+            apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+        try:
+            with connection.begin():
+                yield connection
+        finally:
+            if saved:
+                apply_sqlite_pragmas(dbapi_connection, saved)
+
+
+def bulk_insert(connection, model, rows, chunk_size=CHUNK_SIZE):
+    """INSERT rows (an iterable of dicts) chunk_size at a time; returns the count.
+
+    Each chunk is one executemany of a Core insert, so no ORM objects are
+    built and rows can come from a generator without being held in memory.
+    """
+    table = getattr(model, "__table__", model)
+    rows = iter(rows)
+    total = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return total
+        connection.execute(insert(table), chunk)
+        total += len(chunk)
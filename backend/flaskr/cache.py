@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Small thread-safe in-process cache with per-entry TTL and LRU eviction.
+
+    Entries expire after `ttl` seconds and the least recently used entry is
+    dropped once `max_entries` is reached. Each worker process has its own
+    copy, so writers call invalidate() and the TTL bounds how long other
+    processes can serve stale data.
+    """
+
+    def __init__(self, ttl=30, max_entries=256, config_prefix=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.config_prefix = config_prefix
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def init_app(self, app):
+        if self.config_prefix:
+            self.ttl = app.config.get(f"{self.config_prefix}_TTL", self.ttl)
+            self.max_entries = app.config.get(
+                f"{self.config_prefix}_MAX_ENTRIES", self.max_entries
+            )
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def generation(self):
+        """Counter bumped by invalidate(); pass it to set() with a value
+        computed after reading it, so a racing invalidation drops the value"""
+        return self._generation
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, generation=None):
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            # Drop values computed before an invalidation that raced with them
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_set(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        generation = self._generation
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value, generation)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 3) if lookups else 0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttl": self.ttl,
+            }
+
+
+# Serialized /posts and /posts/user pages, dropped on any write they show
+feed_cache = TTLCache(config_prefix="FEED_CACHE")
+
+# Clustered /posts/map tiles keyed by (zoom, x, y), dropped on any post write
+map_cache = TTLCache(ttl=300, max_entries=2048, config_prefix="MAP_CACHE")
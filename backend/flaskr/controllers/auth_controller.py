@@ -1,3 +1,4 @@
+import logging
 from flask_jwt_extended import create_access_token
 from flask_smorest import abort
 from sqlalchemy import select
@@ -6,6 +7,8 @@ from flaskr.db import db
 from flaskr.models.user_model import UserModel
 from flaskr.utils import check_password
 
+logger = logging.getLogger(__name__)
+
 
 class AuthController:
     @staticmethod
@@ -26,4 +29,5 @@ class AuthController:
             return {"token": token}
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Internal server error while sign in")
             abort(500, message="Internal server error while sign in")
@@ -1,3 +1,4 @@
+import logging
 from flask_jwt_extended import get_jwt_identity
 from flask_smorest import abort
 from sqlalchemy import select
@@ -5,6 +6,8 @@ from sqlalchemy.exc import NoResultFound, SQLAlchemyError
 from flaskr.db import db
 from flaskr.models.category_model import CategoryModel
 
+logger = logging.getLogger(__name__)
+
 
 class CategoryController:
     @staticmethod
@@ -15,6 +18,7 @@ class CategoryController:
                 select(CategoryModel).order_by(CategoryModel.created_at.desc())
             ).scalars().all()
         except SQLAlchemyError:
+            logger.exception("Internal server error while fetching categories")
             abort(500, message="Internal server error while fetching categories")
 
     @staticmethod
@@ -28,6 +32,7 @@ class CategoryController:
         except NoResultFound:
             abort(404, message="Category not found")
         except SQLAlchemyError:
+            logger.exception("Internal server error while fetching category")
             abort(500, message="Internal server error while fetching category")
 
     @staticmethod
@@ -65,6 +70,7 @@ class CategoryController:
             return {"message": "Category created successfully", "id": new_category.id}
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Internal server error while creating category")
             abort(500, message="Internal server error while creating category")
 
     @staticmethod
@@ -111,6 +117,7 @@ class CategoryController:
             abort(404, message="Category not found")
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Internal server error while updating category")
             abort(500, message="Internal server error while updating category")
 
     @staticmethod
@@ -127,4 +134,5 @@ class CategoryController:
             abort(404, message="Category not found")
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Internal server error while deleting category")
             abort(500, message="Internal server error while deleting category")
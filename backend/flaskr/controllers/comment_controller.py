@@ -1,3 +1,4 @@
+import logging
 from flask_jwt_extended import get_jwt_identity
 from flask_smorest import abort
 from sqlalchemy import select
@@ -6,26 +7,32 @@ from flaskr.db import db
 from flaskr.models.comment_model import CommentModel
 from flaskr.models.user_model import UserModel
 
+logger = logging.getLogger(__name__)
+
 
 class CommentController:
+    @staticmethod
+    def _list_query(task_id):
+        # Comments with username for the task, newest first
+        return (
+            select(
+                CommentModel.id,
+                CommentModel.content,
+                CommentModel.created_at,
+                CommentModel.user_id,
+                UserModel.username,
+            )
+            .join(UserModel, CommentModel.user_id == UserModel.id)
+            .where(CommentModel.task_id == task_id)
+            .order_by(CommentModel.created_at.desc())
+        )
+
     @staticmethod
     def get_task_comments(task_id):
         try:
-            # Get comments with username for the task
-            return (
-                db.session.query(
-                    CommentModel.id,
-                    CommentModel.content,
-                    CommentModel.created_at,
-                    CommentModel.user_id,
-                    UserModel.username,
-                )
-                .join(UserModel, CommentModel.user_id == UserModel.id)
-                .filter(CommentModel.task_id == task_id)
-                .order_by(CommentModel.created_at.desc())
-                .all()
-            )
+            return db.session.execute(CommentController._list_query(task_id)).all()
         except SQLAlchemyError:
+            logger.exception("Internal server error while fetching task comments")
             abort(500, message="Internal server error while fetching task comments")
 
     @staticmethod
@@ -44,6 +51,7 @@ class CommentController:
             db.session.commit()
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Internal server error while creating comment")
             abort(500, message="Internal server error while creating comment")
 
     @staticmethod
@@ -68,6 +76,7 @@ class CommentController:
             abort(404, message="Comment not found")
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Internal server error while updating comment")
             abort(500, message="Internal server error while updating comment")
 
     @staticmethod
@@ -88,4 +97,5 @@ class CommentController:
             abort(404, message="Comment not found")
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Internal server error while deleting comment")
             abort(500, message="Internal server error while deleting comment")
\ No newline at end of file
@@ -1,45 +1,91 @@
+import logging
 from flask_jwt_extended import get_jwt_identity
 from flask_smorest import abort
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from flaskr.db import db
 from flaskr.models.favorite_model import FavoriteModel
 from flaskr.models.post_model import PostModel
-from flaskr.schemas.plain_schema import PlainFavoriteSchema, PlainPostSchema
+from flaskr.models.tag_model import TagModel
+from flaskr.models.user_model import UserModel
+from flaskr.pagination import keyset_page, split_page
+from flaskr.schemas.plain_schema import PlainFavoriteSchema
+from flaskr.schemas.serializers import serialize_favorite
+
+logger = logging.getLogger(__name__)
 
 
 class FavoriteController:
     @staticmethod
-    def get_all_by_user():
-        """Get all favorites for the current user"""
+    def _list_query(user_id):
+        """The user's favorites with their posts, as plain rows.
+
+        Post, author and tag columns are selected in the same statement
+        (prefixed with post_ for serialize_favorite), so a list needs no
+        per-favorite lookups.
+        """
+        return (
+            select(
+                FavoriteModel.id,
+                FavoriteModel.notes,
+                FavoriteModel.created_at,
+                FavoriteModel.updated_at,
+                PostModel.id.label("post_id"),
+                PostModel.title.label("post_title"),
+                PostModel.content.label("post_content"),
+                PostModel.status.label("post_status"),
+                PostModel.image.label("post_image"),
+                PostModel.image_variants.label("post_image_variants"),
+                PostModel.latitude.label("post_latitude"),
+                PostModel.longitude.label("post_longitude"),
+                PostModel.created_at.label("post_created_at"),
+                PostModel.updated_at.label("post_updated_at"),
+                PostModel.user_id.label("post_user_id"),
+                UserModel.username.label("post_username"),
+                TagModel.name.label("post_tag_name"),
+            )
+            .join(PostModel, FavoriteModel.post_id == PostModel.id)
+            .join(UserModel, PostModel.user_id == UserModel.id)
+            .outerjoin(TagModel, PostModel.tag_id == TagModel.id)
+            .where(FavoriteModel.user_id == user_id)
+        )
+
+    @staticmethod
+    def get_all_by_user(limit=None, cursor=None):
+        """Get all favorites for the current user, newest first.
+
+        Without limit/cursor the full list is returned as before; with either
+        one the response is a page, the cursor for the next one and the
+        user's total number of favorites.
+        """
         try:
             user_id = get_jwt_identity()
-            favorite_schema = PlainFavoriteSchema()
-            post_schema = PlainPostSchema()
-
-            favorites = db.session.execute(
-                select(FavoriteModel)
+            stmt = FavoriteController._list_query(user_id)
+
+            paginated = limit is not None or cursor is not None
+            if paginated:
+                stmt = keyset_page(stmt, FavoriteModel.created_at, FavoriteModel.id, limit, cursor)
+            else:
+                stmt = stmt.order_by(FavoriteModel.created_at.desc(), FavoriteModel.id.desc())
+
+            rows = db.session.execute(stmt).all()
+            if not paginated:
+                return [serialize_favorite(row) for row in rows]
+
+            rows, next_cursor = split_page(rows, limit)
+            total = db.session.execute(
+                select(func.count())
+                .select_from(FavoriteModel)
                 .where(FavoriteModel.user_id == user_id)
-                .join(PostModel, FavoriteModel.post_id == PostModel.id)
-                .order_by(FavoriteModel.created_at.desc())
-            ).unique().scalars().all()
-
-            result = []
-            for fav in favorites:
-                fav_dict = {
-                    **favorite_schema.dump(fav),
-                    "post": {
-                        **post_schema.dump(fav.post),
-                        "status": fav.post.status.value,
-                        "tagName": fav.post.tag.name if fav.post.tag else None,
-                        "username": fav.post.user.username,
-                        "userId": fav.post.user_id
-                    }
-                }
-                result.append(fav_dict)
-
-            return result
+            ).scalar()
+
+            return {
+                "favorites": [serialize_favorite(row) for row in rows],
+                "nextCursor": next_cursor,
+                "total": total,
+            }
         except SQLAlchemyError:
+            logger.exception("Error fetching favorites")
             abort(500, message="Error fetching favorites")
 
     @staticmethod
@@ -64,8 +110,32 @@ class FavoriteController:
                 **favorite_schema.dump(favorite)
             }
         except SQLAlchemyError:
+            logger.exception("Error checking favorite")
             abort(500, message="Error checking favorite")
 
+    @staticmethod
+    def get_status(post_ids):
+        """Which of the given posts the current user has favorited.
+
+        One IN query on the unique (user_id, post_id) index, so a whole feed
+        page is checked in a single round trip. Returns {"favorited":
+        {"<postId>": favoriteId}}; posts that are not listed are not favorited.
+        """
+        try:
+            user_id = get_jwt_identity()
+
+            rows = db.session.execute(
+                select(FavoriteModel.post_id, FavoriteModel.id).where(
+                    FavoriteModel.user_id == user_id,
+                    FavoriteModel.post_id.in_(set(post_ids)),
+                )
+            ).all()
+
+            return {"favorited": {str(post_id): favorite_id for post_id, favorite_id in rows}}
+        except SQLAlchemyError:
+            logger.exception("Error checking favorites")
+            abort(500, message="Error checking favorites")
+
     @staticmethod
     def create(data):
         """Add a post to favorites"""
@@ -97,6 +167,7 @@ class FavoriteController:
             abort(400, message="Post already in favorites")
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Error adding to favorites")
             abort(500, message="Error adding to favorites")
 
     @staticmethod
@@ -125,6 +196,7 @@ class FavoriteController:
             return favorite_schema.dump(favorite)
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Error updating favorite")
             abort(500, message="Error updating favorite")
 
     @staticmethod
@@ -147,6 +219,7 @@ class FavoriteController:
             db.session.commit()
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Error removing favorite")
             abort(500, message="Error removing favorite")
 
     @staticmethod
@@ -169,4 +242,5 @@ class FavoriteController:
             db.session.commit()
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Error removing favorite")
             abort(500, message="Error removing favorite")
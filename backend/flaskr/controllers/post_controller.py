@@ -1,100 +1,407 @@
+import heapq
+import logging
+from flask import current_app
 from flask_jwt_extended import get_jwt_identity
 from flask_smorest import abort
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import Integer, and_, cast, func, select
 from sqlalchemy.exc import NoResultFound, SQLAlchemyError
+from flaskr.cache import feed_cache, map_cache
 from flaskr.db import db
 from flaskr.models.post_model import PostModel
+from flaskr.models.favorite_model import FavoriteModel
 from flaskr.models.user_model import UserModel
 from flaskr.models.tag_model import TagModel
+from flaskr.log import SAMPLED
+from flaskr.pagination import DEFAULT_PAGE_SIZE, keyset_page, split_page
+from flaskr.geo import (
+    CLUSTER_GRID,
+    CLUSTER_MIN_POINTS,
+    CLUSTER_SAMPLE_SIZE,
+    MAX_MAP_TILES,
+    NEARBY_OVERFETCH,
+    approx_distance,
+    bbox_filter,
+    haversine_km,
+    posts_geo,
+    radius_bbox,
+    tile_bounds,
+    tile_size,
+    tiles_for_bbox,
+)
+from flaskr.heatmap import MAX_HEATMAP_CELLS, apply_heatmap_changes, heatmap_query
+from flaskr.images import existing_variants, schedule_derivatives
+from flaskr.search import build_match_query, search_posts
+from flaskr.uploads import apply_upload_refs
+from flaskr.versioning import get_versions, version_signature
+from flaskr.schemas.serializers import (
+    serialize_feed_post,
+    serialize_feed_post_with_stats,
+    serialize_search_result,
+)
+
+logger = logging.getLogger(__name__)
+
+# Tables a feed page is built from
+FEED_TABLES = ("posts", "users", "tags")
 
 
 class PostController:
     @staticmethod
-    def get_all():
+    def _feed_cache_key(*parts):
+        """feed_cache key for a page, tied to the current table versions.
+
+        Other workers and CLI scripts bump table_versions without clearing
+        this process's cache, so entries are keyed by the versions they were
+        built from and a write anywhere makes the old ones unreachable.
+        """
+        versions = get_versions(db.session, FEED_TABLES)
+        return (*parts, version_signature(versions))
+
+    @staticmethod
+    def _feed_query():
+        """Select only the columns the feed returns, as plain rows"""
+        return (
+            select(
+                PostModel.id,
+                PostModel.title,
+                PostModel.content,
+                PostModel.status,
+                PostModel.image,
+                PostModel.image_variants,
+                PostModel.latitude,
+                PostModel.longitude,
+                PostModel.created_at,
+                PostModel.updated_at,
+                PostModel.user_id,
+                PostModel.tag_id,
+                UserModel.username,
+                TagModel.name.label("tag_name"),
+            )
+            .join(UserModel, PostModel.user_id == UserModel.id)
+            .outerjoin(TagModel, PostModel.tag_id == TagModel.id)
+        )
+
+    @staticmethod
+    def _with_stats(stmt, user_id):
+        """Add rating summary and the caller's favorite flag to a feed statement.
+
+        Ratings come from the aggregates stored on the post. The favorite
+        flag is one outer join against the caller's favorites (at most one
+        row per post thanks to unique_user_post_favorite), so the whole page
+        is still a single query with no per-post lookups.
+        """
+        return (
+            stmt.add_columns(
+                func.round(PostModel.rating_avg, 1).label("average_rating"),
+                PostModel.rating_count.label("total_reviews"),
+                FavoriteModel.id.is_not(None).label("favorited"),
+            )
+            .outerjoin(
+                FavoriteModel,
+                and_(
+                    FavoriteModel.post_id == PostModel.id,
+                    FavoriteModel.user_id == user_id,
+                ),
+            )
+        )
+
+    @staticmethod
+    def _get_feed(stmt, limit=None, cursor=None, with_stats=False):
+        """Run a feed statement, paginated by (created_at, id) when asked to.
+
+        Without limit/cursor the full list is returned as before; with either
+        one the response is a page plus the cursor for the next one.
+        """
+        serialize = serialize_feed_post
+        if with_stats:
+            stmt = PostController._with_stats(stmt, get_jwt_identity())
+            serialize = serialize_feed_post_with_stats
+
+        paginated = limit is not None or cursor is not None
+        if paginated:
+            stmt = keyset_page(stmt, PostModel.created_at, PostModel.id, limit, cursor)
+        else:
+            stmt = stmt.order_by(PostModel.created_at.desc())
+
+        rows = db.session.execute(stmt).all()
+
+        next_cursor = None
+        if paginated:
+            rows, next_cursor = split_page(rows, limit)
+
+        result = [serialize(row) for row in rows]
+        logger.debug("Fetched %d feed posts", len(result), extra=SAMPLED)
+
+        if not paginated:
+            return result
+
+        return {"posts": result, "nextCursor": next_cursor}
+
+    @staticmethod
+    def get_all(limit=None, cursor=None, with_stats=False):
         """Get all posts from all users"""
         try:
-            posts = db.session.execute(
-                select(PostModel)
-                .join(UserModel, PostModel.user_id == UserModel.id)
-                .outerjoin(TagModel, PostModel.tag_id == TagModel.id)
-                .options(joinedload(PostModel.user), joinedload(PostModel.tag))
-                .order_by(PostModel.created_at.desc())
-            ).unique().scalars().all()
-
-            result = []
-            for post in posts:
-                tag_name = post.tag.name if post.tag else None
-                post_dict = {
-                    "id": post.id,
-                    "title": post.title,
-                    "content": post.content,
-                    "status": post.status.value,
-                    "image": post.image,
-                    "latitude": post.latitude,
-                    "longitude": post.longitude,
-                    "createdAt": post.created_at.isoformat() if post.created_at else None,
-                    "updatedAt": post.updated_at.isoformat() if post.updated_at else None,
-                    "userId": post.user_id,
-                    "username": post.user.username,
-                    "tagName": tag_name
-                }
-                print(f"Post ID {post.id}: tagName = {tag_name}, tag_id = {post.tag_id}")
-                result.append(post_dict)
+            def load():
+                return PostController._get_feed(
+                    PostController._feed_query(), limit, cursor, with_stats
+                )
 
-            return result
-        except SQLAlchemyError as e:
-            print(f"Error in get_all: {str(e)}")
+            # Stats pages hold the caller's favorites, so they are not shared
+            if with_stats:
+                return load()
+
+            return feed_cache.get_or_set(
+                PostController._feed_cache_key("all", limit, cursor), load
+            )
+        except SQLAlchemyError:
+            logger.exception("Error in get_all")
             abort(500, message="Internal server error while fetching all posts")
 
     @staticmethod
-    def get_all_on_user():
+    def get_all_on_user(limit=None, cursor=None, with_stats=False):
         """Get posts for the current authenticated user"""
         try:
             user_id = get_jwt_identity()
 
-            posts = db.session.execute(
-                select(PostModel)
-                .where(PostModel.user_id == user_id)
-                .join(UserModel, PostModel.user_id == UserModel.id)
-                .outerjoin(TagModel, PostModel.tag_id == TagModel.id)
-                .options(joinedload(PostModel.user), joinedload(PostModel.tag))
-                .order_by(PostModel.created_at.desc())
-            ).unique().scalars().all()
-
-            result = []
-            for post in posts:
-                tag_name = post.tag.name if post.tag else None
-                post_dict = {
-                    "id": post.id,
-                    "title": post.title,
-                    "content": post.content,
-                    "status": post.status.value,
-                    "image": post.image,
-                    "latitude": post.latitude,
-                    "longitude": post.longitude,
-                    "createdAt": post.created_at.isoformat() if post.created_at else None,
-                    "updatedAt": post.updated_at.isoformat() if post.updated_at else None,
-                    "userId": post.user_id,
-                    "username": post.user.username,
-                    "tagName": tag_name
-                }
-                print(f"User Post ID {post.id}: tagName = {tag_name}, tag_id = {post.tag_id}")
-                result.append(post_dict)
+            def load():
+                return PostController._get_feed(
+                    PostController._feed_query().where(PostModel.user_id == user_id),
+                    limit,
+                    cursor,
+                    with_stats,
+                )
 
-            return result
-        except SQLAlchemyError as e:
-            print(f"Error in get_all_on_user: {str(e)}")
+            if with_stats:
+                return load()
+
+            return feed_cache.get_or_set(
+                PostController._feed_cache_key("user", user_id, limit, cursor), load
+            )
+        except SQLAlchemyError:
+            logger.exception("Error in get_all_on_user")
             abort(500, message="Internal server error while fetching user posts")
 
+    @staticmethod
+    def search(q, limit=None, offset=0):
+        """Full-text search over post titles and content, best matches first"""
+        match_query = build_match_query(q)
+        if match_query is None:
+            abort(400, message="Search query must contain at least one word")
+
+        limit = limit or DEFAULT_PAGE_SIZE
+        try:
+            rows = db.session.execute(
+                search_posts(PostController._feed_query(), match_query)
+                .limit(limit + 1)
+                .offset(offset)
+            ).all()
+
+            return {
+                "posts": [serialize_search_result(row) for row in rows[:limit]],
+                "nextOffset": offset + limit if len(rows) > limit else None,
+            }
+        except SQLAlchemyError:
+            logger.exception("Error searching posts")
+            abort(500, message="Internal server error while searching posts")
+
+    @staticmethod
+    def nearby(lat, lng, radius=10, limit=None):
+        """Posts within radius km of a point, closest first.
+
+        The posts_geo R*Tree narrows the search to the bounding box of the
+        circle, and SQL sorts those candidates by an approximate distance so
+        only a few times `limit` of them are returned. Exact great-circle
+        distances are computed for these, and just the closest `limit`
+        posts are loaded.
+        """
+        limit = limit or DEFAULT_PAGE_SIZE
+        try:
+            min_lat, max_lat, lng_ranges = radius_bbox(lat, lng, radius)
+            candidates = db.session.execute(
+                select(PostModel.id, PostModel.latitude, PostModel.longitude)
+                .join(posts_geo, posts_geo.c.id == PostModel.id)
+                .where(bbox_filter(min_lat, max_lat, lng_ranges))
+                .order_by(approx_distance(lat, lng))
+                .limit(limit * NEARBY_OVERFETCH)
+            ).all()
+
+            distances = {}
+            for candidate in candidates:
+                distance = haversine_km(lat, lng, candidate.latitude, candidate.longitude)
+                if distance <= radius:
+                    distances[candidate.id] = distance
+
+            closest = heapq.nsmallest(limit, distances, key=distances.get)
+            if not closest:
+                return {"posts": []}
+
+            rows = db.session.execute(
+                PostController._feed_query().where(PostModel.id.in_(closest))
+            ).all()
+            rows.sort(key=lambda row: distances[row.id])
+
+            return {
+                "posts": [
+                    {**serialize_feed_post(row), "distanceKm": round(distances[row.id], 3)}
+                    for row in rows
+                ]
+            }
+        except SQLAlchemyError:
+            logger.exception("Error fetching nearby posts")
+            abort(500, message="Internal server error while fetching nearby posts")
+
+    @staticmethod
+    def _cluster_tiles(zoom, tiles):
+        """Clusters and lone points for a set of map tiles, in one query.
+
+        Posts are bucketed on a grid aligned to the tiles, so a cell never
+        spans two tiles and tiles can be cached independently. Counts and
+        centroids are computed per cell in SQL over the rectangle covering
+        the tiles; only the newest few posts of each cell come back as rows,
+        tagged with their tile. Returns {(x, y): (clusters, points)}.
+        """
+        min_x = min(x for x, _ in tiles)
+        max_x = max(x for x, _ in tiles)
+        min_y = min(y for _, y in tiles)
+        max_y = max(y for _, y in tiles)
+        min_lat, _, min_lng, _ = tile_bounds(zoom, min_x, min_y)
+        _, max_lat, _, max_lng = tile_bounds(zoom, max_x, max_y)
+
+        cell = tile_size(zoom) / CLUSTER_GRID
+        cell_x = cast((PostModel.longitude + 180.0) / cell, Integer)
+        cell_y = cast((PostModel.latitude + 90.0) / cell, Integer)
+        per_cell = (cell_x, cell_y)
+
+        located = (
+            select(
+                PostModel.id,
+                PostModel.title,
+                PostModel.latitude,
+                PostModel.longitude,
+                cell_x.label("cell_x"),
+                cell_y.label("cell_y"),
+                (cell_x // CLUSTER_GRID).label("tile_x"),
+                (cell_y // CLUSTER_GRID).label("tile_y"),
+                func.count().over(partition_by=per_cell).label("count"),
+                func.avg(PostModel.latitude).over(partition_by=per_cell).label("center_lat"),
+                func.avg(PostModel.longitude).over(partition_by=per_cell).label("center_lng"),
+                func.row_number()
+                .over(partition_by=per_cell, order_by=PostModel.id.desc())
+                .label("position"),
+            )
+            .join(posts_geo, posts_geo.c.id == PostModel.id)
+            .where(
+                bbox_filter(min_lat, max_lat, [(min_lng, max_lng)]),
+                # Points on a tile edge belong to exactly one tile
+                cell_x.between(min_x * CLUSTER_GRID, (max_x + 1) * CLUSTER_GRID - 1),
+                cell_y.between(min_y * CLUSTER_GRID, (max_y + 1) * CLUSTER_GRID - 1),
+            )
+            .subquery()
+        )
+        rows = db.session.execute(
+            select(located)
+            .where(located.c.position <= max(CLUSTER_SAMPLE_SIZE, CLUSTER_MIN_POINTS - 1))
+            .order_by(
+                located.c.tile_y,
+                located.c.tile_x,
+                located.c.cell_y,
+                located.c.cell_x,
+                located.c.position,
+            )
+        ).all()
+
+        result = {tile: ([], []) for tile in tiles}
+        seen = set()
+        for row in rows:
+            tile = result.get((row.tile_x, row.tile_y))
+            if tile is None:
+                # Inside the covering rectangle but not one of the tiles asked for
+                continue
+            clusters, points = tile
+            if row.count < CLUSTER_MIN_POINTS:
+                points.append({
+                    "id": row.id,
+                    "title": row.title,
+                    "latitude": row.latitude,
+                    "longitude": row.longitude,
+                })
+            elif (row.cell_x, row.cell_y) not in seen:
+                seen.add((row.cell_x, row.cell_y))
+                clusters.append({
+                    "latitude": row.center_lat,
+                    "longitude": row.center_lng,
+                    "count": row.count,
+                    "postIds": [],
+                })
+            if row.count >= CLUSTER_MIN_POINTS and row.position <= CLUSTER_SAMPLE_SIZE:
+                clusters[-1]["postIds"].append(row.id)
+        return result
+
+    @staticmethod
+    def map_clusters(bbox, zoom):
+        """Clustered posts for a map viewport, built from cached tiles.
+
+        Tiles are cached under the posts table version, so writes from other
+        processes are picked up; all tiles missing from the cache are
+        computed together in a single query.
+        """
+        min_lng, min_lat, max_lng, max_lat = bbox
+        tiles = tiles_for_bbox(min_lng, min_lat, max_lng, max_lat, zoom)
+        if len(tiles) > MAX_MAP_TILES:
+            abort(400, message="Bounding box is too large for this zoom level")
+
+        def inside(item):
+            return (
+                min_lat <= item["latitude"] <= max_lat
+                and min_lng <= item["longitude"] <= max_lng
+            )
+
+        try:
+            version = version_signature(get_versions(db.session, ["posts"]))
+            generation = map_cache.generation
+            cached = {tile: map_cache.get((version, zoom, *tile)) for tile in tiles}
+            missing = [tile for tile, value in cached.items() if value is None]
+            if missing:
+                for tile, value in PostController._cluster_tiles(zoom, missing).items():
+                    map_cache.set((version, zoom, *tile), value, generation)
+                    cached[tile] = value
+
+            clusters, points = [], []
+            for tile in tiles:
+                tile_clusters, tile_points = cached[tile]
+                clusters.extend(item for item in tile_clusters if inside(item))
+                points.extend(item for item in tile_points if inside(item))
+
+            return {"zoom": zoom, "clusters": clusters, "points": points}
+        except SQLAlchemyError:
+            logger.exception("Error clustering map posts")
+            abort(500, message="Internal server error while fetching map posts")
+
+    @staticmethod
+    def heatmap(bbox, precision):
+        """Post counts per geohash cell in a bounding box, from heatmap_cells"""
+        min_lng, min_lat, max_lng, max_lat = bbox
+        try:
+            rows = db.session.execute(
+                heatmap_query(precision, min_lng, min_lat, max_lng, max_lat)
+            ).all()
+        except SQLAlchemyError:
+            logger.exception("Error fetching heatmap")
+            abort(500, message="Internal server error while fetching heatmap")
+
+        if len(rows) > MAX_HEATMAP_CELLS:
+            abort(400, message="Too many cells for this bounding box, use a lower precision")
+
+        # [lat, lng, count] triples, the input format of most heatmap layers
+        return {"precision": precision, "cells": [list(row) for row in rows]}
+
     @staticmethod
     def create(data):
         try:
             user_id = get_jwt_identity()
 
             tag_id = data.get("tag_id")
-            print(f"Creating post with tag_id: {tag_id}")
-            print(f"Full data: {data}")
+            logger.debug("Creating post for user %s with tag_id %s", user_id, tag_id)
 
             # Create post with single tag
             new_post = PostModel(
@@ -103,19 +410,26 @@ class PostController:
                 content=data["content"],
                 status=data["status"],
                 image=data.get("image"),
+                image_variants=existing_variants(db.session, data.get("image")),
                 latitude=data.get("latitude"),
                 longitude=data.get("longitude"),
                 tag_id=tag_id
             )
 
             db.session.add(new_post)
+            apply_heatmap_changes(db.session, added=[(new_post.latitude, new_post.longitude)])
+            apply_upload_refs(db.session, added=[new_post.image])
             db.session.commit()
             db.session.refresh(new_post)
+            feed_cache.invalidate()
+            map_cache.invalidate()
+            if new_post.image_variants is None:
+                schedule_derivatives(current_app._get_current_object(), new_post.image)
 
-            print(f"Post created successfully: ID={new_post.id}, tag_id={new_post.tag_id}")
+            logger.info("Post created: id=%s tag_id=%s", new_post.id, new_post.tag_id)
         except SQLAlchemyError as e:
             db.session.rollback()
-            print(f"Error creating post: {str(e)}")
+            logger.exception("Error creating post")
             abort(500, message=f"Error: {str(e)}")
 
     @staticmethod
@@ -130,6 +444,7 @@ class PostController:
             if not post:
                 abort(404, message="Post not found")
 
+            old_location = (post.latitude, post.longitude)
             post.title = data["title"]
             post.content = data["content"]
             post.status = data["status"]
@@ -138,16 +453,29 @@ class PostController:
             if "tag_id" in data:
                 post.tag_id = data["tag_id"]
 
-            if "image" in data:
-                post.image = data["image"]
+            new_image = data.get("image") if data.get("image") != post.image else None
+            if new_image:
+                variants = existing_variants(db.session, new_image)
+                apply_upload_refs(db.session, added=[new_image], removed=[post.image])
+                post.image = new_image
+                post.image_variants = variants
             if "latitude" in data:
                 post.latitude = data["latitude"]
             if "longitude" in data:
                 post.longitude = data["longitude"]
 
+            new_location = (post.latitude, post.longitude)
+            if new_location != old_location:
+                apply_heatmap_changes(db.session, removed=[old_location], added=[new_location])
+
             db.session.commit()
+            feed_cache.invalidate()
+            map_cache.invalidate()
+            if new_image and post.image_variants is None:
+                schedule_derivatives(current_app._get_current_object(), new_image)
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Error updating post")
             abort(500, message="Error updating post")
 
     @staticmethod
@@ -161,9 +489,13 @@ class PostController:
             ).scalar_one_or_none()
             if not post:
                 abort(404, message="Post not found")
+            apply_heatmap_changes(db.session, removed=[(post.latitude, post.longitude)])
+            apply_upload_refs(db.session, removed=[post.image])
             db.session.delete(post)
             db.session.commit()
+            feed_cache.invalidate()
+            map_cache.invalidate()
         except SQLAlchemyError as e:
             db.session.rollback()
-            print(f"Error deleting post: {str(e)}")  # Debug logging
+            logger.exception("Error deleting post %s", post_id)
             abort(500, message=f"Error deleting post: {str(e)}")
@@ -1,49 +1,57 @@
+import logging
 from flask_jwt_extended import get_jwt_identity
 from flask_smorest import abort
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from flaskr.db import db
 from flaskr.models.review_model import ReviewModel
 from flaskr.models.user_model import UserModel
 from flaskr.models.post_model import PostModel
-from flaskr.schemas.plain_schema import PlainReviewSchema
+from flaskr.ratings import apply_rating_delta
+from flaskr.schemas.serializers import serialize_review
+
+logger = logging.getLogger(__name__)
 
 
 class ReviewController:
+    @staticmethod
+    def _list_query(post_id):
+        """A post's reviews, newest first, with the reviewer name from the join"""
+        return (
+            select(
+                ReviewModel.id,
+                ReviewModel.rating,
+                ReviewModel.comment,
+                ReviewModel.user_id,
+                UserModel.username,
+                ReviewModel.created_at,
+                ReviewModel.updated_at,
+            )
+            .where(ReviewModel.post_id == post_id)
+            .join(UserModel, ReviewModel.user_id == UserModel.id)
+            .order_by(ReviewModel.created_at.desc())
+        )
+
     @staticmethod
     def get_all_by_post(post_id):
         """Get all reviews for a specific post with average rating"""
         try:
-            schema = PlainReviewSchema()
-
-            # Get reviews
-            reviews = db.session.execute(
-                select(ReviewModel)
-                .where(ReviewModel.post_id == post_id)
-                .join(UserModel, ReviewModel.user_id == UserModel.id)
-                .order_by(ReviewModel.created_at.desc())
-            ).scalars().all()
+            reviews = db.session.execute(ReviewController._list_query(post_id)).all()
 
-            # Calculate average rating
+            # Average rating is kept on the post by create/update/delete
             avg_rating = db.session.execute(
-                select(func.avg(ReviewModel.rating))
-                .where(ReviewModel.post_id == post_id)
+                select(PostModel.rating_avg).where(PostModel.id == post_id)
             ).scalar()
 
             result = {
-                "reviews": [
-                    {
-                        **schema.dump(review),
-                        "username": review.user.username,
-                    }
-                    for review in reviews
-                ],
+                "reviews": [serialize_review(review) for review in reviews],
                 "averageRating": round(avg_rating, 1) if avg_rating else 0,
                 "totalReviews": len(reviews)
             }
 
             return result
         except SQLAlchemyError:
+            logger.exception("Error fetching reviews")
             abort(500, message="Error fetching reviews")
 
     @staticmethod
@@ -68,6 +76,7 @@ class ReviewController:
                 "post_id": review.post_id
             }
         except SQLAlchemyError:
+            logger.exception("Error fetching review")
             abort(500, message="Error fetching review")
 
     @staticmethod
@@ -93,6 +102,7 @@ class ReviewController:
             )
 
             db.session.add(new_review)
+            apply_rating_delta(db.session, data["post_id"], data["rating"], 1)
             db.session.commit()
 
             return {
@@ -108,6 +118,7 @@ class ReviewController:
             abort(400, message="You have already reviewed this post")
         except SQLAlchemyError as e:
             db.session.rollback()
+            logger.exception("Error creating review")
             abort(500, message=f"Error creating review: {str(e)}")
 
     @staticmethod
@@ -127,6 +138,9 @@ class ReviewController:
 
             # Update fields
             if "rating" in data:
+                apply_rating_delta(
+                    db.session, review.post_id, data["rating"] - review.rating, 0
+                )
                 review.rating = data["rating"]
             if "comment" in data:
                 review.comment = data["comment"]
@@ -143,6 +157,7 @@ class ReviewController:
             }
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Error updating review")
             abort(500, message="Error updating review")
 
     @staticmethod
@@ -160,8 +175,10 @@ class ReviewController:
             if not review:
                 abort(404, message="Review not found or you don't have permission")
 
+            apply_rating_delta(db.session, review.post_id, -review.rating, -1)
             db.session.delete(review)
             db.session.commit()
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Error deleting review")
             abort(500, message="Error deleting review")
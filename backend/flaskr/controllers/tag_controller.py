@@ -1,9 +1,13 @@
+import logging
 from flask_smorest import abort
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError, NoResultFound
+from flaskr.cache import feed_cache
 from flaskr.db import db
 from flaskr.models.tag_model import TagModel
 
+logger = logging.getLogger(__name__)
+
 
 class TagController:
     @staticmethod
@@ -11,6 +15,7 @@ class TagController:
         try:
             return db.session.execute(select(TagModel).limit(15)).scalars().all()
         except SQLAlchemyError:
+            logger.exception("Internal server error while fetching tags")
             abort(500, message="Internal server error while fetching tags")
 
     @staticmethod
@@ -29,6 +34,7 @@ class TagController:
             db.session.commit()
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Internal server error while creating tag")
             abort(500, message="Internal server error while creating tag")
 
     @staticmethod
@@ -55,11 +61,13 @@ class TagController:
                 setattr(tag, key, value)
 
             db.session.commit()
+            feed_cache.invalidate()
             return {"message": "Tag updated successfully"}
         except NoResultFound:
             abort(404, message="Tag not found")
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Internal server error while updating tag")
             abort(500, message="Internal server error while updating tag")
 
     @staticmethod
@@ -71,10 +79,12 @@ class TagController:
 
             db.session.delete(tag)
             db.session.commit()
+            feed_cache.invalidate()
         except NoResultFound:
             abort(404, message="Tag not found")
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Internal server error while deleting tag")
             abort(500, message="Internal server error while deleting tag")
 
     @staticmethod
@@ -99,7 +109,9 @@ class TagController:
                 db.session.delete(tag)
 
             db.session.commit()
+            feed_cache.invalidate()
             return {"message": f"Successfully deleted {deleted_count} tag(s)", "deleted_count": deleted_count}
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Internal server error while deleting tags")
             abort(500, message="Internal server error while deleting tags")
@@ -1,3 +1,4 @@
+import logging
 from flask_jwt_extended import get_jwt_identity
 from flask_smorest import abort
 from sqlalchemy import select
@@ -5,28 +6,38 @@ from sqlalchemy.exc import NoResultFound, SQLAlchemyError
 from flaskr.db import db
 from flaskr.models.tag_model import TagModel
 from flaskr.models.task_model import TaskModel
+from flaskr.schemas.serializers import serialize_task
+
+logger = logging.getLogger(__name__)
 
 
 class TaskController:
+    @staticmethod
+    def _list_query(user_id):
+        """A user's tasks with their tag name, as plain rows"""
+        return (
+            select(
+                TaskModel.id,
+                TaskModel.title,
+                TaskModel.content,
+                TaskModel.status,
+                TaskModel.created_at,
+                TagModel.name.label("tag_name"),
+            )
+            .where(TaskModel.user_id == user_id)
+            .join(TagModel, TaskModel.tag_id == TagModel.id)
+        )
+
     @staticmethod
     def get_all_on_user():
         try:
             user_id = get_jwt_identity()
 
-            return (
-                db.session.query(
-                    TaskModel.id,
-                    TaskModel.title,
-                    TaskModel.content,
-                    TaskModel.status,
-                    TaskModel.created_at,
-                    TagModel.name.label("tag_name"),
-                )
-                .where(TaskModel.user_id == user_id)
-                .join(TagModel, TaskModel.tag_id == TagModel.id)
-                .all()
-            )
+            tasks = db.session.execute(TaskController._list_query(user_id)).all()
+
+            return [serialize_task(task) for task in tasks]
         except SQLAlchemyError:
+            logger.exception("Internal server error while fetching tasks on user")
             abort(500, message="Internal server error while fetching tasks on user")
 
     @staticmethod
@@ -53,6 +64,7 @@ class TaskController:
 
             return task
         except SQLAlchemyError:
+            logger.exception("Internal server error while fetching task")
             abort(500, message="Internal server error while fetching task")
 
     @staticmethod
@@ -68,6 +80,7 @@ class TaskController:
             db.session.commit()
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Internal server error while creating task")
             abort(500, message="Internal server error while creating task")
 
     @staticmethod
@@ -95,6 +108,7 @@ class TaskController:
             abort(404, message="Task not found or you don't have permission to edit it")
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Internal server error while updating task")
             abort(500, message="Internal server error while updating task")
 
     @staticmethod
@@ -115,4 +129,5 @@ class TaskController:
             abort(404, message="Task not found or you don't have permission to delete it")
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Internal server error while deleting task")
             abort(500, message="Internal server error while deleting task")
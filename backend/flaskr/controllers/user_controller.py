@@ -1,11 +1,17 @@
+import logging
 from flask_jwt_extended import get_jwt_identity
 from flask_smorest import abort
 from sqlalchemy import select
 from sqlalchemy.exc import NoResultFound, SQLAlchemyError
+from flaskr.cache import feed_cache, map_cache
+from flaskr.heatmap import apply_heatmap_changes
+from flaskr.uploads import apply_upload_refs
 from flaskr.db import db
 from flaskr.models.user_model import UserModel
 from flaskr.utils import generate_password
 
+logger = logging.getLogger(__name__)
+
 
 class UserController:
     @staticmethod
@@ -13,6 +19,7 @@ class UserController:
         try:
             return db.session.execute(select(UserModel)).scalars().all()
         except SQLAlchemyError:
+            logger.exception("Internal server error while fetching users")
             abort(500, message="Internal server error while fetching users")
 
     @staticmethod
@@ -24,6 +31,7 @@ class UserController:
         except NoResultFound:
             abort(404, message="User not found")
         except SQLAlchemyError:
+            logger.exception("Internal server error while fetching user")
             abort(500, message="Internal server error while fetching user")
 
     @staticmethod
@@ -50,7 +58,7 @@ class UserController:
             db.session.commit()
         except SQLAlchemyError as e:
             db.session.rollback()
-            print(f"Error creating user: {str(e)}")  # Debug logging
+            logger.exception("Error creating user")
             abort(500, message=f"Internal server error while creating user: {str(e)}")
 
     @staticmethod
@@ -66,6 +74,7 @@ class UserController:
         except NoResultFound:
             abort(404, message="User not found")
         except SQLAlchemyError:
+            logger.exception("Internal server error while fetching current user")
             abort(500, message="Internal server error while fetching current user")
 
     @staticmethod
@@ -110,11 +119,13 @@ class UserController:
                 user.password = generate_password(data["password"])
 
             db.session.commit()
+            feed_cache.invalidate()
             return {"message": "User updated successfully"}
         except NoResultFound:
             abort(404, message="User not found")
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Internal server error while updating user")
             abort(500, message="Internal server error while updating user")
 
     @staticmethod
@@ -126,10 +137,17 @@ class UserController:
                 select(UserModel).where(UserModel.id == user_id)
             ).scalar_one()
 
+            apply_heatmap_changes(
+                db.session, removed=[(post.latitude, post.longitude) for post in user.posts]
+            )
+            apply_upload_refs(db.session, removed=[post.image for post in user.posts])
             db.session.delete(user)
             db.session.commit()
+            feed_cache.invalidate()
+            map_cache.invalidate()
         except NoResultFound:
             abort(404, message="User not found")
         except SQLAlchemyError:
             db.session.rollback()
+            logger.exception("Internal server error while deleting user")
             abort(500, message="Internal server error while deleting user")
@@ -1,5 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, event
 from sqlalchemy.orm import DeclarativeBase
 
 
@@ -16,3 +16,33 @@ class Base(DeclarativeBase):
 
 
 db = SQLAlchemy(model_class=Base)
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas):
+    """Run PRAGMA name=value for each item on a raw sqlite3 connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def init_sqlite_pragmas(app):
+    """Apply SQLITE_PRAGMAS to every new connection of the app's SQLite engines.
+
+    Pragmas such as synchronous, cache_size and mmap_size only last for one
+    connection, so they are set from the engine's connect event rather than
+    once at startup.
+    """
+    pragmas = app.config.get("SQLITE_PRAGMAS")
+    if not pragmas:
+        return
+
+    def on_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == "sqlite":
+                event.listen(engine, "connect", on_connect)
@@ -0,0 +1,158 @@
+import math
+from sqlalchemy import DDL, and_, column, event, func, or_, table
+from flaskr.models.post_model import PostModel
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+# Nearby search ranks the box candidates by a flat-earth estimate in SQL and
+# re-checks this many times the page size with the exact distance
+NEARBY_OVERFETCH = 2
+
+# Map clustering: each tile is split into CLUSTER_GRID x CLUSTER_GRID cells.
+# Cells with fewer than CLUSTER_MIN_POINTS posts are returned as points.
+MAX_MAP_ZOOM = 20
+MAX_MAP_TILES = 64
+CLUSTER_GRID = 8
+CLUSTER_MIN_POINTS = 3
+CLUSTER_SAMPLE_SIZE = 3
+
+# R*Tree over post coordinates, one zero-size box per located post. The
+# triggers keep it in step with every write to posts; posts without both
+# coordinates are simply left out.
+RTREE_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS posts_geo USING rtree(
+        id, min_lat, max_lat, min_lng, max_lng
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_geo_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_geo
+        SELECT new.id, new.latitude, new.latitude, new.longitude, new.longitude
+        WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_geo_ad AFTER DELETE ON posts BEGIN
+        DELETE FROM posts_geo WHERE id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_geo_au AFTER UPDATE OF latitude, longitude ON posts BEGIN
+        DELETE FROM posts_geo WHERE id = old.id;
+        INSERT INTO posts_geo
+        SELECT new.id, new.latitude, new.latitude, new.longitude, new.longitude
+        WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL;
+    END
+    """,
+)
+
+posts_geo = table(
+    "posts_geo",
+    column("id"),
+    column("min_lat"),
+    column("max_lat"),
+    column("min_lng"),
+    column("max_lng"),
+)
+
+for statement in RTREE_DDL:
+    event.listen(
+        PostModel.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_bbox(lat, lng, radius_km):
+    """Lat/lng box that contains every point within radius_km of (lat, lng).
+
+    Returns (min_lat, max_lat, lng_ranges) where lng_ranges has two entries
+    when the box crosses the antimeridian.
+    """
+    d_lat = radius_km / KM_PER_DEGREE_LAT
+    min_lat, max_lat = max(-90.0, lat - d_lat), min(90.0, lat + d_lat)
+
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if max_lat >= 90.0 or min_lat <= -90.0 or cos_lat < 1e-6:
+        return min_lat, max_lat, [(-180.0, 180.0)]
+
+    d_lng = radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+    if d_lng >= 180.0:
+        return min_lat, max_lat, [(-180.0, 180.0)]
+
+    min_lng, max_lng = lng - d_lng, lng + d_lng
+    if min_lng < -180.0:
+        return min_lat, max_lat, [(min_lng + 360.0, 180.0), (-180.0, max_lng)]
+    if max_lng > 180.0:
+        return min_lat, max_lat, [(min_lng, 180.0), (-180.0, max_lng - 360.0)]
+    return min_lat, max_lat, [(min_lng, max_lng)]
+
+
+def bbox_filter(min_lat, max_lat, lng_ranges):
+    """R*Tree overlap condition on posts_geo for a box"""
+    return and_(
+        posts_geo.c.min_lat <= max_lat,
+        posts_geo.c.max_lat >= min_lat,
+        or_(*(
+            and_(posts_geo.c.min_lng <= max_lng, posts_geo.c.max_lng >= min_lng)
+            for min_lng, max_lng in lng_ranges
+        )),
+    )
+
+
+def approx_distance(lat, lng):
+    """SQL ordering key for the distance of posts from (lat, lng).
+
+    Squared equirectangular distance in degrees: longitude differences are
+    wrapped at the antimeridian and scaled by the cosine of lat. Close to
+    the great-circle order for the radii nearby search allows, and cheap
+    enough to sort every candidate of the R*Tree box.
+    """
+    d_lat = PostModel.latitude - lat
+    d_lng = func.abs(PostModel.longitude - lng)
+    d_lng = func.min(d_lng, 360.0 - d_lng) * math.cos(math.radians(lat))
+    return d_lat * d_lat + d_lng * d_lng
+
+
+def tile_size(zoom):
+    """Edge length in degrees of a map tile at a zoom level"""
+    return 360.0 / (1 << zoom)
+
+
+def tile_bounds(zoom, x, y):
+    """(min_lat, max_lat, min_lng, max_lng) of tile (x, y) at zoom"""
+    size = tile_size(zoom)
+    return (
+        -90.0 + y * size,
+        min(90.0, -90.0 + (y + 1) * size),
+        -180.0 + x * size,
+        -180.0 + (x + 1) * size,
+    )
+
+
+def tiles_for_bbox(min_lng, min_lat, max_lng, max_lat, zoom):
+    """Tile (x, y) pairs at zoom that cover a bounding box"""
+    size = tile_size(zoom)
+    last_x = (1 << zoom) - 1
+    last_y = math.ceil(180.0 / size) - 1
+
+    def index(value, offset, last):
+        return min(last, max(0, int((value + offset) // size)))
+
+    xs = range(index(min_lng, 180.0, last_x), index(max_lng, 180.0, last_x) + 1)
+    ys = range(index(min_lat, 90.0, last_y), index(max_lat, 90.0, last_y) + 1)
+    return [(x, y) for y in ys for x in xs]
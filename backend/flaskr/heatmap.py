@@ -0,0 +1,154 @@
+from collections import Counter, defaultdict
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.dialects.sqlite import insert
+from flaskr.models.heatmap_cell_model import HeatmapCellModel
+from flaskr.models.post_model import PostModel
+
+# Geohash precisions kept in heatmap_cells, from ~5000 km down to ~1 km cells
+HEATMAP_PRECISIONS = (1, 2, 3, 4, 5, 6)
+MAX_HEATMAP_CELLS = 20000
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(lat, lng, precision):
+    """Geohash of a point at the given precision (number of characters)"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, lng) if even else (lat_range, lat)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def geohash_center(geohash):
+    """(lat, lng) centre of a geohash cell"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _BASE32.index(char)
+        for shift in range(4, -1, -1):
+            interval = lng_range if even else lat_range
+            middle = (interval[0] + interval[1]) / 2
+            if value >> shift & 1:
+                interval[0] = middle
+            else:
+                interval[1] = middle
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lng_range[0] + lng_range[1]) / 2
+
+
+def cell_size(precision):
+    """(height, width) in degrees of a geohash cell"""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def _cells(lat, lng):
+    geohash = encode_geohash(lat, lng, max(HEATMAP_PRECISIONS))
+    return [(precision, geohash[:precision]) for precision in HEATMAP_PRECISIONS]
+
+
+def _upsert(session, counts):
+    rows = []
+    for (precision, geohash), delta in counts.items():
+        if delta:
+            lat, lng = geohash_center(geohash)
+            rows.append({
+                "precision": precision,
+                "geohash": geohash,
+                "latitude": lat,
+                "longitude": lng,
+                "count": delta,
+            })
+    if not rows:
+        return
+
+    stmt = insert(HeatmapCellModel)
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["precision", "geohash"],
+            set_={"count": HeatmapCellModel.count + stmt.excluded.count},
+        ),
+        rows,
+    )
+
+    # Only cells that lost posts can have dropped to zero; one IN list per
+    # precision keeps the delete on the primary key
+    emptied = defaultdict(list)
+    for row in rows:
+        if row["count"] < 0:
+            emptied[row["precision"]].append(row["geohash"])
+    if emptied:
+        session.execute(
+            delete(HeatmapCellModel).where(
+                or_(*(
+                    and_(HeatmapCellModel.precision == precision, HeatmapCellModel.geohash.in_(geohashes))
+                    for precision, geohashes in emptied.items()
+                )),
+                HeatmapCellModel.count <= 0,
+            )
+        )
+
+
+def apply_heatmap_changes(session, removed=(), added=()):
+    """Adjust cell counts for posts leaving and entering the map.
+
+    removed and added are (lat, lng) pairs, e.g. the old and new location
+    of an edited post; pairs with a missing coordinate are ignored. Runs in
+    the caller's transaction.
+    """
+    counts = Counter()
+    for points, delta in ((removed, -1), (added, 1)):
+        for lat, lng in points:
+            if lat is not None and lng is not None:
+                for cell in _cells(lat, lng):
+                    counts[cell] += delta
+    _upsert(session, counts)
+
+
+def rebuild_heatmap(session, batch_size=5000):
+    """Recount every cell from posts; returns the number of located posts"""
+    counts = Counter()
+    located = 0
+    rows = session.execute(
+        select(PostModel.latitude, PostModel.longitude).where(
+            PostModel.latitude.is_not(None), PostModel.longitude.is_not(None)
+        ).execution_options(yield_per=batch_size)
+    )
+    for lat, lng in rows:
+        counts.update(_cells(lat, lng))
+        located += 1
+
+    session.execute(delete(HeatmapCellModel))
+    items = list(counts.items())
+    for start in range(0, len(items), batch_size):
+        _upsert(session, dict(items[start:start + batch_size]))
+    session.commit()
+    return located
+
+
+def heatmap_query(precision, min_lng, min_lat, max_lng, max_lat):
+    """Cells of one precision whose area overlaps a bounding box"""
+    height, width = cell_size(precision)
+    return (
+        select(HeatmapCellModel.latitude, HeatmapCellModel.longitude, HeatmapCellModel.count)
+        .where(
+            HeatmapCellModel.precision == precision,
+            HeatmapCellModel.latitude.between(min_lat - height / 2, max_lat + height / 2),
+            HeatmapCellModel.longitude.between(min_lng - width / 2, max_lng + width / 2),
+        )
+        .limit(MAX_HEATMAP_CELLS + 1)
+    )
@@ -0,0 +1,66 @@
+import hashlib
+from datetime import timezone
+from functools import wraps
+from flask import make_response, request
+from flask_jwt_extended import get_jwt_identity
+from flaskr.db import db
+from flaskr.versioning import get_versions, version_signature
+
+
+def conditional_get(*table_names, per_user=False, stats_tables=()):
+    """Answer If-None-Match from the table change counters.
+
+    The ETag is derived from the versions of the tables the endpoint reads,
+    the request path and query string, and the caller when the body is per
+    user. A matching request gets a 304 before the view (and its query or
+    serialization) runs at all.
+
+    For feeds taking ?withStats=, stats_tables are only read, and the body
+    only holds the caller's favorites, when the view gets with_stats=True:
+    just then are they added and the ETag scoped to the caller. Such views
+    need this decorator below bp.arguments so the parsed flag is passed.
+
+    Only the ETag validates: Last-Modified is sent for information but has
+    one-second resolution, so If-Modified-Since would answer 304 for a
+    write made in the same second as the cached response.
+
+    Versions are read before the view, so a write racing with the request
+    can only make the ETag older than the body, never newer: the client
+    simply refetches on its next poll.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with_stats = bool(stats_tables) and kwargs.get("with_stats", False)
+            tables = table_names + (stats_tables if with_stats else ())
+            versions = get_versions(db.session, tables)
+
+            signature = version_signature(versions)
+            scope = get_jwt_identity() if per_user or with_stats else ""
+            etag = hashlib.sha1(
+                f"{request.full_path}|{scope}|{signature}".encode()
+            ).hexdigest()
+
+            timestamps = [ts for _, ts in versions.values() if ts is not None]
+            last_modified = (
+                max(timestamps).replace(tzinfo=timezone.utc, microsecond=0)
+                if timestamps else None
+            )
+
+            if request.if_none_match.contains(etag):
+                response = make_response("", 304)
+            else:
+                response = make_response(func(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+
+        return wrapper
+
+    return decorator
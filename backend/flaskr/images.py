@@ -0,0 +1,142 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from sqlalchemy import select, update
+from flaskr.cache import feed_cache
+from flaskr.db import db
+from flaskr.models.post_model import PostModel
+from flaskr.versioning import bump_versions
+
+logger = logging.getLogger(__name__)
+
+# File extension and Pillow save options per derivative format
+FORMATS = {
+    "webp": ("webp", {"method": 4}),
+    "jpeg": ("jpg", {"optimize": True, "progressive": True}),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = None
+
+
+def derivative_name(filename, width, fmt):
+    """File name of one derivative, e.g. abc.png -> abc_600.webp"""
+    stem = filename.rsplit(".", 1)[0]
+    return f"{stem}_{width}.{FORMATS[fmt][0]}"
+
+
+def make_derivatives(folder, filename, widths, formats, quality):
+    """Write resized copies of an uploaded image next to it.
+
+    Runs in a worker process. Images are never upscaled, EXIF orientation
+    is applied, and each file is written under a temporary name and moved
+    into place so a half-written derivative is never served. Returns
+    {"<width>": {"<format>": name}}.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(os.path.join(folder, filename)) as original:
+        image = ImageOps.exif_transpose(original)
+        image.load()
+
+    variants = {}
+    for width in sorted(widths):
+        resized = image.copy()
+        resized.thumbnail((width, width * 10), Image.Resampling.LANCZOS)
+
+        variants[str(width)] = {}
+        for fmt in formats:
+            frame = resized
+            if fmt == "jpeg" and frame.mode not in ("RGB", "L"):
+                frame = frame.convert("RGB")
+            elif frame.mode not in ("RGB", "RGBA", "L"):
+                frame = frame.convert("RGBA")
+
+            name = derivative_name(filename, width, fmt)
+            path = os.path.join(folder, name)
+            tmp_path = f"{path}.tmp"
+            frame.save(tmp_path, format=fmt.upper(), quality=quality, **FORMATS[fmt][1])
+            os.replace(tmp_path, path)
+            variants[str(width)][fmt] = name
+    return variants
+
+
+def _get_executor(app):
+    global _executor, _pending
+    with _executor_lock:
+        if _executor is None:
+            # spawn: forking a threaded web server can deadlock the child
+            _executor = ProcessPoolExecutor(
+                max_workers=app.config["IMAGE_WORKERS"],
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _pending = threading.BoundedSemaphore(app.config["IMAGE_MAX_PENDING"])
+            atexit.register(_executor.shutdown, wait=False, cancel_futures=True)
+        return _executor
+
+
+def store_variants(app, filename, variants):
+    """Attach derivative names to every post that uses the image"""
+    with app.app_context():
+        result = db.session.execute(
+            update(PostModel)
+            .where(PostModel.image == filename)
+            .values(image_variants=variants, updated_at=PostModel.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            bump_versions(db.session.connection(), ["posts"])
+        db.session.commit()
+    feed_cache.invalidate()
+
+
+def existing_variants(session, filename):
+    """Derivatives already made for a stored file, e.g. by an earlier post"""
+    if not filename:
+        return None
+    return session.execute(
+        select(PostModel.image_variants)
+        .where(PostModel.image == filename, PostModel.image_variants.is_not(None))
+        .limit(1)
+    ).scalar()
+
+
+def schedule_derivatives(app, filename):
+    """Queue derivative generation for an uploaded image.
+
+    Returns False without queueing when the pipeline is disabled or
+    IMAGE_MAX_PENDING jobs are already waiting; posts then keep serving
+    the original, and generate_image_derivatives.py can catch up later.
+    """
+    if not filename or app.config["IMAGE_WORKERS"] <= 0:
+        return False
+
+    executor = _get_executor(app)
+    if not _pending.acquire(blocking=False):
+        logger.warning("Image pipeline is full, serving %s without derivatives", filename)
+        return False
+
+    future = executor.submit(
+        make_derivatives,
+        app.config["UPLOAD_FOLDER"],
+        filename,
+        app.config["IMAGE_DERIVATIVE_WIDTHS"],
+        app.config["IMAGE_DERIVATIVE_FORMATS"],
+        app.config["IMAGE_QUALITY"],
+    )
+
+    def done(future):
+        _pending.release()
+        try:
+            store_variants(app, filename, future.result())
+        except CancelledError:
+            pass
+        except Exception:
+            logger.exception("Could not create derivatives for %s", filename)
+
+    future.add_done_callback(done)
+    return True
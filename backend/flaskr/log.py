@@ -0,0 +1,59 @@
+import atexit
+import logging
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
+# Pass as extra= on hot-path debug lines so only LOG_SAMPLE_RATE of them
+# are kept, e.g. logger.debug("Fetched %d posts", n, extra=SAMPLED)
+SAMPLED = {"sampled": True}
+
+_listener = None
+_sampling_filter = None
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a random fraction of records flagged as sampled"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if getattr(record, "sampled", False):
+            return random.random() < self.rate
+        return True
+
+
+def init_logging(app):
+    """Route the flaskr.* loggers through a queue drained by a background thread.
+
+    Request threads only format the record and put it on the queue; the
+    QueueListener thread does the actual stream writes. Records below
+    LOG_LEVEL are dropped by the logger before any formatting happens.
+    """
+    global _listener, _sampling_filter
+
+    logger = logging.getLogger("flaskr")
+    logger.setLevel(app.config["LOG_LEVEL"])
+
+    # create_app may run more than once per process (scripts, tests)
+    if _listener is not None:
+        _sampling_filter.rate = app.config["LOG_SAMPLE_RATE"]
+        return
+
+    log_queue = queue.SimpleQueue()
+
+    _sampling_filter = SamplingFilter(app.config["LOG_SAMPLE_RATE"])
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(_sampling_filter)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(app.config["LOG_FORMAT"]))
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    logger.addHandler(queue_handler)
+    logger.propagate = False
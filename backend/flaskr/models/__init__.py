@@ -7,3 +7,6 @@ from flaskr.models.post_tag_model import PostTagModel
 from flaskr.models.category_model import CategoryModel
 from flaskr.models.review_model import ReviewModel
 from flaskr.models.favorite_model import FavoriteModel
+from flaskr.models.table_version_model import TableVersionModel
+from flaskr.models.heatmap_cell_model import HeatmapCellModel
+from flaskr.models.upload_model import UploadModel
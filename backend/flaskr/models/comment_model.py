@@ -15,4 +15,9 @@ class CommentModel(db.Model):
     
     # Relationships
     user = db.relationship("UserModel", back_populates="comments")
-    task = db.relationship("TaskModel", back_populates="comments")
\ No newline at end of file
+    task = db.relationship("TaskModel", back_populates="comments")
+
+    # A task's comments, newest first
+    __table_args__ = (
+        db.Index("ix_comments_task_id_created_at", "task_id", "created_at"),
+    )
\ No newline at end of file
@@ -29,4 +29,6 @@ class FavoriteModel(db.Model):
     # Constraints - one favorite per user per post
     __table_args__ = (
         db.UniqueConstraint('user_id', 'post_id', name='unique_user_post_favorite'),
+        # A user's favorites, newest first
+        db.Index('ix_favorites_user_id_created_at', 'user_id', 'created_at'),
     )
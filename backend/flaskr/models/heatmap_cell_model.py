@@ -0,0 +1,18 @@
+from sqlalchemy import Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from flaskr.db import db
+
+
+class HeatmapCellModel(db.Model):
+    __tablename__ = "heatmap_cells"
+
+    # Number of located posts per geohash cell, one row set per precision
+    precision: Mapped[int] = mapped_column(Integer, primary_key=True)
+    geohash: Mapped[str] = mapped_column(String(12), primary_key=True)
+    latitude: Mapped[float] = mapped_column(Float, nullable=False)  # cell centre
+    longitude: Mapped[float] = mapped_column(Float, nullable=False)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index("ix_heatmap_cells_precision_latitude", "precision", "latitude"),
+    )
@@ -1,5 +1,5 @@
 from enum import Enum
-from sqlalchemy import ForeignKey, String, Float, Enum as SaEnum
+from sqlalchemy import ForeignKey, String, Float, Integer, JSON, Enum as SaEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from flaskr.db import db
 from datetime import datetime, timezone
@@ -21,9 +21,24 @@ class PostModel(db.Model):
     status: Mapped[PostStatus] = mapped_column(
         SaEnum(PostStatus), nullable=False, default=PostStatus.NATURA
     )
-    image: Mapped[Optional[str]] = mapped_column(String(300), nullable=True)
+    # Indexed: posts sharing a stored file are looked up by it (see flaskr/images.py)
+    image: Mapped[Optional[str]] = mapped_column(String(300), nullable=True, index=True)
+    # Resized copies of image, {"<width>": {"webp": name, "jpeg": name}};
+    # None until the background pipeline has produced them (see flaskr/images.py)
+    image_variants: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     latitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     longitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+    # Review aggregates, kept in step by ReviewController (see flaskr/ratings.py)
+    rating_sum: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    rating_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    rating_avg: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0, server_default="0", index=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         index=True, default=lambda: datetime.now(timezone.utc)
     )
@@ -36,9 +51,14 @@ class PostModel(db.Model):
     user = relationship("UserModel", back_populates="posts")
 
     # One-to-many relationship with tags (single tag per post)
-    tag_id: Mapped[Optional[int]] = mapped_column(ForeignKey("tags.id", ondelete="SET NULL"), nullable=True)
+    tag_id: Mapped[Optional[int]] = mapped_column(ForeignKey("tags.id", ondelete="SET NULL"), nullable=True, index=True)
     tag = relationship("TagModel", back_populates="posts")
 
     # Cascade delete relationships
     reviews = relationship("ReviewModel", back_populates="post", cascade="all, delete-orphan")
     favorites = relationship("FavoriteModel", back_populates="post", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # A user's posts, newest first (/posts/user); id is implied as the last key
+        db.Index("ix_posts_user_id_created_at", "user_id", "created_at"),
+    )
@@ -31,4 +31,6 @@ class ReviewModel(db.Model):
         CheckConstraint('rating >= 1 AND rating <= 5', name='check_rating_range'),
         # Ensure one review per user per post
         db.UniqueConstraint('user_id', 'post_id', name='unique_user_post_review'),
+        # A post's reviews, newest first
+        db.Index('ix_reviews_post_id_created_at', 'post_id', 'created_at'),
     )
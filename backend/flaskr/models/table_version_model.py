@@ -0,0 +1,15 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+from flaskr.db import db
+from datetime import datetime, timezone
+
+
+class TableVersionModel(db.Model):
+    __tablename__ = "table_versions"
+
+    # One row per table, bumped in the same transaction as every write to it
+    table_name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        default=lambda: datetime.now(timezone.utc)
+    )
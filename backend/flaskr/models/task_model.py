@@ -26,7 +26,7 @@ class TaskModel(db.Model):
         index=True, default=lambda: datetime.now(timezone.utc)
     )
 
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
     user = relationship("UserModel", back_populates="tasks")
 
     tag_id: Mapped[int] = mapped_column(ForeignKey("tags.id"), nullable=False)
@@ -0,0 +1,18 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from flaskr.db import db
+from datetime import datetime, timezone
+from typing import Optional
+
+
+class UploadModel(db.Model):
+    __tablename__ = "uploads"
+
+    # Stored file name in UPLOAD_FOLDER, "<sha256>.<ext>" for new uploads
+    filename: Mapped[str] = mapped_column(String(300), primary_key=True)
+    size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Number of posts whose image is this file
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        default=lambda: datetime.now(timezone.utc)
+    )
@@ -0,0 +1,55 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from flask_smorest import abort
+from sqlalchemy import or_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(created_at, row_id):
+    """Build an opaque cursor pointing just after (created_at, row_id)"""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Turn an opaque cursor back into a (created_at, row_id) pair"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, ValueError, TypeError):
+        abort(400, message="Invalid cursor")
+
+
+def keyset_page(stmt, created_at_col, id_col, limit=None, cursor=None):
+    """Restrict a newest-first statement to one page after the cursor.
+
+    The bound on created_at alone lets SQLite walk the created_at index
+    backwards; the id comparison only breaks ties inside that range.
+    One extra row is fetched so callers can tell if another page exists.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            created_at_col <= created_at,
+            or_(created_at_col < created_at, id_col < row_id),
+        )
+
+    return (
+        stmt.order_by(created_at_col.desc(), id_col.desc())
+        .limit((limit or DEFAULT_PAGE_SIZE) + 1)
+    )
+
+
+def split_page(rows, limit=None, key=lambda row: (row.created_at, row.id)):
+    """Trim the look-ahead row and return (rows, next_cursor)"""
+    limit = limit or DEFAULT_PAGE_SIZE
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
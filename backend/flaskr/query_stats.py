@@ -0,0 +1,143 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from flaskr.db import db
+
+logger = logging.getLogger(__name__)
+
+# Query collectors active in the current thread/context: one per request
+# plus any assert_query_budget blocks
+_budgets = ContextVar("query_budgets", default=())
+
+
+class QueryStats:
+    """Statements run, and time spent in the database, for one unit of work"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def record(self, statement, seconds):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold):
+        """Statements run at least threshold times: likely N+1 lazy loads"""
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+
+    if has_request_context() and "query_stats" in g:
+        g.query_stats.record(statement, elapsed)
+    for stats in _budgets.get():
+        stats.record(statement, elapsed)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute: drop its start
+    # time so the next statement on this connection is not timed from it
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start"):
+        connection.info["query_start"].pop()
+
+
+def _start_request():
+    g.query_stats = QueryStats()
+
+
+def _finish_request(response, config):
+    stats = g.pop("query_stats", None)
+    if stats is None:
+        return response
+
+    milliseconds = stats.seconds * 1000
+    if config["QUERY_STATS_HEADERS"]:
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time-Ms"] = f"{milliseconds:.1f}"
+        response.headers.add(
+            "Server-Timing", f'db;dur={milliseconds:.1f};desc="{stats.count} queries"'
+        )
+
+    logger.debug(
+        "%s %s: %d queries in %.1fms", request.method, request.path, stats.count, milliseconds
+    )
+    for statement, count in stats.repeated(config["QUERY_REPEAT_THRESHOLD"]):
+        logger.warning(
+            "Possible N+1 in %s %s: statement ran %d times: %s",
+            request.method, request.path, count, " ".join(statement.split())[:300],
+        )
+    return response
+
+
+def init_query_stats(app):
+    """Count queries and database time per request.
+
+    Hooks before/after_cursor_execute (and handle_error, for statements
+    that fail) on the app's engines. Each request's
+    totals are logged (and sent as X-DB-Query-Count, X-DB-Time-Ms and
+    Server-Timing headers when QUERY_STATS_HEADERS is set), and statements
+    repeated QUERY_REPEAT_THRESHOLD times or more are logged as N+1 suspects.
+    """
+    if not app.config["QUERY_STATS_ENABLED"]:
+        return
+
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(engine, "handle_error", _handle_error)
+
+    app.before_request(_start_request)
+    app.after_request(lambda response: _finish_request(response, app.config))
+
+
+@contextmanager
+def assert_query_budget(max_queries, max_repeats=None):
+    """Fail if the block runs more than max_queries statements.
+
+    For tests and scripts, e.g.
+
+        with assert_query_budget(3):
+            client.get("/api/v1/favorites", headers=auth)
+
+    With max_repeats, also fail when one statement runs more often than
+    that (an N+1 pattern that stays under the total budget). Needs
+    QUERY_STATS_ENABLED so the engine hooks are installed.
+    """
+    stats = QueryStats()
+    token = _budgets.set(_budgets.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _budgets.reset(token)
+
+    problems = []
+    if stats.count > max_queries:
+        problems.append(f"{stats.count} queries run, budget is {max_queries}")
+    if max_repeats is not None:
+        problems.extend(
+            f"statement ran {count} times (max {max_repeats}): {' '.join(statement.split())[:200]}"
+            for statement, count in stats.repeated(max_repeats + 1)
+        )
+    if problems:
+        details = "\n".join(
+            f"  {count}x {' '.join(statement.split())[:200]}"
+            for statement, count in stats.statements.most_common()
+        )
+        raise AssertionError("; ".join(problems) + "\n" + details)
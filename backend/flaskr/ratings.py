@@ -0,0 +1,87 @@
+from sqlalchemy import Float, case, cast, func, select, update
+from flaskr.models.post_model import PostModel
+from flaskr.models.review_model import ReviewModel
+
+
+def _average(rating_sum, rating_count):
+    return case(
+        (rating_count > 0, cast(rating_sum, Float) / rating_count),
+        else_=0,
+    )
+
+
+def apply_rating_delta(session, post_id, sum_delta, count_delta):
+    """Adjust a post's stored review aggregates in the current transaction.
+
+    The new values are computed by SQLite from the stored ones, so
+    concurrent reviews on the same post cannot lose each other's update.
+    """
+    rating_sum = PostModel.rating_sum + sum_delta
+    rating_count = PostModel.rating_count + count_delta
+    session.execute(
+        update(PostModel)
+        .where(PostModel.id == post_id)
+        .values(
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            rating_avg=_average(rating_sum, rating_count),
+            # Ratings are not an edit of the post itself
+            updated_at=PostModel.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def reconcile_ratings(session, fix=True, batch_size=1000):
+    """Compare the stored aggregates with the reviews table.
+
+    Returns the ids of posts whose stored values had drifted; with fix=True
+    they are recomputed from reviews, batch_size posts per UPDATE.
+    """
+    totals = (
+        select(
+            ReviewModel.post_id,
+            func.sum(ReviewModel.rating).label("rating_sum"),
+            func.count().label("rating_count"),
+        )
+        .group_by(ReviewModel.post_id)
+        .subquery()
+    )
+    actual_sum = func.coalesce(totals.c.rating_sum, 0)
+    actual_count = func.coalesce(totals.c.rating_count, 0)
+
+    drifted = session.execute(
+        select(PostModel.id)
+        .outerjoin(totals, totals.c.post_id == PostModel.id)
+        .where(
+            (PostModel.rating_sum != actual_sum)
+            | (PostModel.rating_count != actual_count)
+        )
+    ).scalars().all()
+
+    if fix:
+        review_sum = (
+            select(func.coalesce(func.sum(ReviewModel.rating), 0))
+            .where(ReviewModel.post_id == PostModel.id)
+            .scalar_subquery()
+        )
+        review_count = (
+            select(func.count())
+            .where(ReviewModel.post_id == PostModel.id)
+            .scalar_subquery()
+        )
+        for start in range(0, len(drifted), batch_size):
+            session.execute(
+                update(PostModel)
+                .where(PostModel.id.in_(drifted[start:start + batch_size]))
+                .values(
+                    rating_sum=review_sum,
+                    rating_count=review_count,
+                    rating_avg=_average(review_sum, review_count),
+                    updated_at=PostModel.updated_at,
+                )
+                .execution_options(synchronize_session=False)
+            )
+        session.commit()
+
+    return drifted
@@ -0,0 +1,92 @@
+from sqlalchemy import case, func, select, update
+from flaskr.models.post_model import PostModel, PostStatus
+from flaskr.models.tag_model import TagModel
+from flaskr.versioning import bump_versions
+
+# Tag names that fit each post status; names missing from the tags table
+# are skipped, and statuses left without any fall back to every tag
+TAG_MAPPING = {
+    PostStatus.NATURA: ["River", "Mountain", "Beach", "Forest", "Lake", "Ocean", "Waterfall"],
+    PostStatus.URBAN: ["City", "Street", "Building", "Park", "Mall", "Square"],
+    PostStatus.RURAL: ["Desert", "Village", "Farm", "Countryside", "Field", "Ranch"],
+}
+
+
+def _pick(tag_ids):
+    """SQL expression spreading posts over tag_ids by id"""
+    if len(tag_ids) == 1:
+        return tag_ids[0]
+    return case(
+        {index: tag_id for index, tag_id in enumerate(tag_ids)},
+        value=PostModel.id % len(tag_ids),
+    )
+
+
+def tag_expression(session, mapping=TAG_MAPPING):
+    """CASE on posts.status giving the new tag_id, or None if there are no tags"""
+    tag_ids = dict(session.execute(select(TagModel.name, TagModel.id)).all())
+    if not tag_ids:
+        return None
+
+    fallback = sorted(tag_ids.values())
+    whens = []
+    for status in PostStatus:
+        available = [tag_ids[name] for name in mapping.get(status, []) if name in tag_ids]
+        whens.append((PostModel.status == status, _pick(available or fallback)))
+    return case(*whens, else_=_pick(fallback))
+
+
+def retag_posts(session, only_untagged=True, start_after=0, chunk_size=5000, progress=None):
+    """Set posts' tag_id from their status according to TAG_MAPPING.
+
+    Posts are walked in id order, chunk_size at a time; each chunk is one
+    UPDATE ... SET tag_id = CASE ... over its id range, committed on its
+    own, so an interrupted run can be resumed with start_after set to the
+    last id reported (with only_untagged, simply running again also picks
+    up where it stopped). The choice among a status' tags is spread by
+    post id, so reruns give the same result. progress, if given, is called
+    with (last_id, updated) after every chunk.
+
+    Returns the number of posts updated, or None if there are no tags.
+    """
+    new_tag = tag_expression(session)
+    if new_tag is None:
+        return None
+
+    conditions = [PostModel.tag_id.is_(None)] if only_untagged else []
+    last_id = start_after
+    updated = 0
+    while True:
+        chunk_end = session.execute(
+            select(PostModel.id)
+            .where(PostModel.id > last_id, *conditions)
+            .order_by(PostModel.id)
+            .offset(chunk_size - 1)
+            .limit(1)
+        ).scalar()
+
+        chunk_range = [PostModel.id > last_id]
+        if chunk_end is not None:
+            chunk_range.append(PostModel.id <= chunk_end)
+
+        result = session.execute(
+            update(PostModel)
+            .where(*chunk_range, *conditions)
+            .values(tag_id=new_tag, updated_at=PostModel.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            bump_versions(session.connection(), ["posts"])
+        session.commit()
+
+        updated += result.rowcount
+        if chunk_end is None:
+            last_id = max(last_id, session.execute(select(func.max(PostModel.id))).scalar() or 0)
+        else:
+            last_id = chunk_end
+        if progress is not None:
+            progress(last_id, updated)
+        if chunk_end is None:
+            break
+
+    return updated
@@ -3,7 +3,14 @@ from flask_jwt_extended import jwt_required
 from flask_smorest import Blueprint
 from flask.views import MethodView
 from flaskr.controllers.favorite_controller import FavoriteController
-from flaskr.schemas.schema import FavoriteSchema, UpdateFavoriteSchema
+from flaskr.http_cache import conditional_get
+from flaskr.schemas.serializers import json_response
+from flaskr.schemas.schema import (
+    FavoriteSchema,
+    FavoriteStatusSchema,
+    PageQuerySchema,
+    UpdateFavoriteSchema,
+)
 
 bp = Blueprint("favorites", __name__)
 
@@ -11,9 +18,16 @@ bp = Blueprint("favorites", __name__)
 @bp.route("/favorites")
 class Favorites(MethodView):
     @jwt_required()
-    def get(self):
-        """Get all favorites for the current user"""
-        return FavoriteController.get_all_by_user()
+    @conditional_get("favorites", "posts", "users", "tags", per_user=True)
+    @bp.arguments(PageQuerySchema, location="query", as_kwargs=True)
+    @bp.response(200)
+    def get(self, **page_args):
+        """Get all favorites for the current user
+
+        Pass ?limit= and/or ?cursor= to get one page plus a nextCursor and
+        the total number of favorites
+        """
+        return json_response(FavoriteController.get_all_by_user(**page_args))
 
     @jwt_required()
     @bp.arguments(FavoriteSchema)
@@ -23,6 +37,16 @@ class Favorites(MethodView):
         return FavoriteController.create(favorite_data)
 
 
+@bp.route("/favorites/status")
+class FavoriteStatus(MethodView):
+    @jwt_required()
+    @bp.arguments(FavoriteStatusSchema)
+    @bp.response(200)
+    def post(self, data):
+        """Check which of up to 500 posts are favorited by the current user"""
+        return FavoriteController.get_status(data["post_ids"])
+
+
 @bp.route("/favorites/<int:favorite_id>")
 class FavoriteById(MethodView):
     @jwt_required()
@@ -1,50 +1,38 @@
-from flask import request, current_app
+from flask import request
 from flask_jwt_extended import jwt_required
 from flask_smorest import Blueprint, abort
 from flask.views import MethodView
-from werkzeug.utils import secure_filename
+from werkzeug.exceptions import HTTPException
+from flaskr.cache import feed_cache
 from flaskr.controllers.post_controller import PostController
-from flaskr.schemas.schema import PostSchema, UpdatePostSchema
-import os
-import uuid
+from flaskr.http_cache import conditional_get
+from flaskr.schemas.serializers import json_response
+from flaskr.schemas.schema import (
+    FeedQuerySchema,
+    HeatmapQuerySchema,
+    MapQuerySchema,
+    NearbyQuerySchema,
+    SearchQuerySchema,
+    UpdatePostSchema,
+)
+from flaskr.uploads import save_image
 
 bp = Blueprint("posts", __name__)
 
 
-def allowed_file(filename):
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
-
-
-def validate_image_file(file):
-    """Validate image file size and type"""
-    if not file or not file.filename:
-        return None, None
-
-    if not allowed_file(file.filename):
-        abort(400, message="Invalid file type. Allowed types: png, jpg, jpeg, gif, webp")
-
-    # Check file size (read first to validate, then save)
-    file.seek(0, os.SEEK_END)
-    file_size = file.tell()
-    file.seek(0)
-
-    if file_size > current_app.config['MAX_CONTENT_LENGTH']:
-        abort(400, message="File size exceeds 16MB limit")
-
-    if file_size == 0:
-        abort(400, message="File is empty")
-
-    return file, file_size
-
-
 @bp.route("/posts")
 class Posts(MethodView):
     @jwt_required()
-    @bp.response(200, PostSchema(many=True))
-    def get(self):
-        """Protected route (JWT Required) - Get all posts from all users"""
-        return PostController.get_all()
+    @bp.arguments(FeedQuerySchema, location="query", as_kwargs=True)
+    @conditional_get("posts", "users", "tags", stats_tables=("reviews", "favorites"))
+    @bp.response(200)
+    def get(self, **page_args):
+        """Protected route (JWT Required) - Get all posts from all users
+
+        Pass ?limit= and/or ?cursor= to get one page plus a nextCursor, and
+        ?withStats=true to add averageRating, totalReviews and favorited
+        """
+        return json_response(PostController.get_all(**page_args))
 
     @jwt_required()
     def post(self):
@@ -71,26 +59,15 @@ class Posts(MethodView):
                 except (ValueError, TypeError):
                     pass
 
-            # Handle file upload with validation
-            if 'image' in request.files:
-                file = request.files['image']
-                validated_file, _ = validate_image_file(file)
-
-                if validated_file:
-                    # Ensure upload directory exists
-                    os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True)
-
-                    # Generate unique filename
-                    ext = validated_file.filename.rsplit('.', 1)[1].lower()
-                    filename = f"{uuid.uuid4()}.{ext}"
-                    filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-
-                    # Save file
-                    validated_file.save(filepath)
-                    data['image'] = filename
+            # The upload was size- and type-checked while it streamed in
+            image = save_image(request.files.get('image'))
+            if image:
+                data['image'] = image
 
             PostController.create(data)
             return {"message": "Post created successfully"}, 201
+        except HTTPException:
+            raise
         except Exception as e:
             abort(500, message=f"Error creating post: {str(e)}")
 
@@ -98,10 +75,84 @@ class Posts(MethodView):
 @bp.route("/posts/user")
 class PostsOnUser(MethodView):
     @jwt_required()
-    @bp.response(200, PostSchema(many=True))
+    @bp.arguments(FeedQuerySchema, location="query", as_kwargs=True)
+    @conditional_get("posts", "users", "tags", per_user=True, stats_tables=("reviews", "favorites"))
+    @bp.response(200)
+    def get(self, **page_args):
+        """Protected route (JWT Required) - Get posts for current user only
+
+        Pass ?limit= and/or ?cursor= to get one page plus a nextCursor, and
+        ?withStats=true to add averageRating, totalReviews and favorited
+        """
+        return json_response(PostController.get_all_on_user(**page_args))
+
+
+@bp.route("/posts/search")
+class PostsSearch(MethodView):
+    @jwt_required()
+    @conditional_get("posts", "users", "tags")
+    @bp.arguments(SearchQuerySchema, location="query", as_kwargs=True)
+    @bp.response(200)
+    def get(self, q, limit=None, offset=0):
+        """Protected route (JWT Required) - Full-text search over posts
+
+        Results are ranked with bm25 (title weighs more than content) and
+        carry a highlighted snippet; pass nextOffset back as ?offset=
+        """
+        return json_response(PostController.search(q, limit, offset))
+
+
+@bp.route("/posts/nearby")
+class PostsNearby(MethodView):
+    @jwt_required()
+    @conditional_get("posts", "users", "tags")
+    @bp.arguments(NearbyQuerySchema, location="query", as_kwargs=True)
+    @bp.response(200)
+    def get(self, lat, lng, radius=10, limit=None):
+        """Protected route (JWT Required) - Posts within ?radius= km of ?lat=&lng=
+
+        Sorted by great-circle distance, each post carrying distanceKm
+        """
+        return json_response(PostController.nearby(lat, lng, radius, limit))
+
+
+@bp.route("/posts/map")
+class PostsMap(MethodView):
+    @jwt_required()
+    @conditional_get("posts")
+    @bp.arguments(MapQuerySchema, location="query", as_kwargs=True)
+    @bp.response(200)
+    def get(self, bbox, zoom):
+        """Protected route (JWT Required) - Clustered posts for a map viewport
+
+        ?bbox=minLng,minLat,maxLng,maxLat&zoom= returns clusters (centroid,
+        count, sample postIds) for dense areas and single points elsewhere
+        """
+        return json_response(PostController.map_clusters(bbox, zoom))
+
+
+@bp.route("/posts/heatmap")
+class PostsHeatmap(MethodView):
+    @jwt_required()
+    @conditional_get("posts")
+    @bp.arguments(HeatmapQuerySchema, location="query", as_kwargs=True)
+    @bp.response(200)
+    def get(self, bbox, precision=4):
+        """Protected route (JWT Required) - Post density for a heatmap layer
+
+        ?bbox=minLng,minLat,maxLng,maxLat&precision=1..6 returns cells as
+        [lat, lng, count] arrays
+        """
+        return json_response(PostController.heatmap(bbox, precision))
+
+
+@bp.route("/posts/cache-stats")
+class PostsCacheStats(MethodView):
+    @jwt_required()
+    @bp.response(200)
     def get(self):
-        """Protected route (JWT Required) - Get posts for current user only"""
-        return PostController.get_all_on_user()
+        """Protected route (JWT Required) - Hit/miss counters of the feed cache"""
+        return feed_cache.stats()
 
 
 @bp.route("/posts/<post_id>")
@@ -134,26 +185,15 @@ class PostById(MethodView):
                 except (ValueError, TypeError):
                     pass
 
-            # Handle file upload with validation
-            if 'image' in request.files:
-                file = request.files['image']
-                validated_file, _ = validate_image_file(file)
-
-                if validated_file:
-                    # Ensure upload directory exists
-                    os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True)
-
-                    # Generate unique filename
-                    ext = validated_file.filename.rsplit('.', 1)[1].lower()
-                    filename = f"{uuid.uuid4()}.{ext}"
-                    filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-
-                    # Save file
-                    validated_file.save(filepath)
-                    data['image'] = filename
+            # The upload was size- and type-checked while it streamed in
+            image = save_image(request.files.get('image'))
+            if image:
+                data['image'] = image
 
             PostController.update(data, post_id)
             return {"message": "Post updated successfully"}, 200
+        except HTTPException:
+            raise
         except Exception as e:
             abort(500, message=f"Error updating post: {str(e)}")
 
@@ -3,6 +3,8 @@ from flask_jwt_extended import jwt_required
 from flask_smorest import Blueprint
 from flask.views import MethodView
 from flaskr.controllers.review_controller import ReviewController
+from flaskr.http_cache import conditional_get
+from flaskr.schemas.serializers import json_response
 from flaskr.schemas.schema import ReviewSchema, UpdateReviewSchema
 
 bp = Blueprint("reviews", __name__)
@@ -11,9 +13,10 @@ bp = Blueprint("reviews", __name__)
 @bp.route("/posts/<int:post_id>/reviews")
 class ReviewsByPost(MethodView):
     @jwt_required()
+    @conditional_get("reviews", "users")
     def get(self, post_id):
         """Get all reviews for a post"""
-        return ReviewController.get_all_by_post(post_id)
+        return json_response(ReviewController.get_all_by_post(post_id))
 
     @jwt_required()
     @bp.arguments(ReviewSchema)
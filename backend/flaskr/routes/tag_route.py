@@ -2,6 +2,7 @@ from flask import request
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
 from flaskr.controllers.tag_controller import TagController
+from flaskr.http_cache import conditional_get
 from flaskr.schemas.schema import TagSchema, UpdateTagSchema
 from flask_jwt_extended import jwt_required
 
@@ -10,6 +11,7 @@ bp = Blueprint("tags", __name__)
 
 @bp.route("/tags")
 class Tags(MethodView):
+    @conditional_get("tags")
     @bp.response(200, TagSchema(many=True))
     def get(self):
         return TagController.get_all()
@@ -3,6 +3,7 @@ from flask_smorest import Blueprint
 from flask.views import MethodView
 from flaskr.controllers.task_controller import TaskController
 from flaskr.schemas.schema import TaskSchema, UpdateTaskSchema
+from flaskr.schemas.serializers import json_response
 
 bp = Blueprint("tasks", __name__)
 
@@ -13,7 +14,7 @@ class Tasks(MethodView):
     @bp.response(200, TaskSchema(many=True))
     def get(self):
         """Protected route (JWT Required) - Get all tasks for current user"""
-        return TaskController.get_all_on_user()
+        return json_response(TaskController.get_all_on_user())
 
     @jwt_required()
     @bp.arguments(TaskSchema)
@@ -29,7 +30,7 @@ class TasksOnUser(MethodView):
     @bp.response(200, TaskSchema(many=True))
     def get(self):
         """Protected route (JWT Required)"""
-        return TaskController.get_all_on_user()
+        return json_response(TaskController.get_all_on_user())
 
 
 @bp.route("/tasks/<task_id>")
@@ -1,4 +1,10 @@
-from marshmallow import Schema, fields, validate
+from marshmallow import Schema, ValidationError, fields, validate
+from flaskr.geo import MAX_MAP_ZOOM
+from flaskr.heatmap import HEATMAP_PRECISIONS
+from flaskr.pagination import MAX_PAGE_SIZE
+
+# Post ids accepted by one POST /favorites/status call
+MAX_FAVORITE_STATUS_IDS = 500
 
 
 class PlainUserSchema(Schema):
@@ -77,3 +83,58 @@ class PlainFavoriteSchema(Schema):
     post_id = fields.Int(required=True, load_only=True, data_key="postId")
     created_at = fields.DateTime(dump_only=True, data_key="createdAt")
     updated_at = fields.DateTime(dump_only=True, data_key="updatedAt")
+
+
+class PlainFavoriteStatusSchema(Schema):
+    post_ids = fields.List(
+        fields.Int(strict=True),
+        required=True,
+        data_key="postIds",
+        validate=validate.Length(min=1, max=MAX_FAVORITE_STATUS_IDS),
+    )
+
+
+class BBoxField(fields.Field):
+    """"minLng,minLat,maxLng,maxLat" query value, loaded as a tuple of floats"""
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        try:
+            min_lng, min_lat, max_lng, max_lat = (float(part) for part in value.split(","))
+        except (AttributeError, ValueError):
+            raise ValidationError("Expected minLng,minLat,maxLng,maxLat")
+
+        if not (-90 <= min_lat <= max_lat <= 90):
+            raise ValidationError("Latitudes must satisfy -90 <= minLat <= maxLat <= 90")
+        if min_lng > max_lng:
+            raise ValidationError("minLng must not be greater than maxLng")
+
+        # Map widgets report longitudes past +-180 after panning around the globe
+        return max(-180.0, min_lng), min_lat, min(180.0, max_lng), max_lat
+
+
+class PlainPageQuerySchema(Schema):
+    limit = fields.Int(required=False, validate=validate.Range(min=1, max=MAX_PAGE_SIZE))
+    cursor = fields.Str(required=False)
+
+
+class PlainNearbyQuerySchema(Schema):
+    lat = fields.Float(required=True, validate=validate.Range(min=-90, max=90))
+    lng = fields.Float(required=True, validate=validate.Range(min=-180, max=180))
+    radius = fields.Float(load_default=10, validate=validate.Range(min=0, max=500, min_inclusive=False))  # km
+    limit = fields.Int(required=False, validate=validate.Range(min=1, max=MAX_PAGE_SIZE))
+
+
+class PlainMapQuerySchema(Schema):
+    bbox = BBoxField(required=True)
+    zoom = fields.Int(required=True, validate=validate.Range(min=0, max=MAX_MAP_ZOOM))
+
+
+class PlainHeatmapQuerySchema(Schema):
+    bbox = BBoxField(required=True)
+    precision = fields.Int(load_default=4, validate=validate.OneOf(HEATMAP_PRECISIONS))
+
+
+class PlainSearchQuerySchema(Schema):
+    q = fields.Str(required=True, validate=validate.Length(min=1, max=200))
+    limit = fields.Int(required=False, validate=validate.Range(min=1, max=MAX_PAGE_SIZE))
+    offset = fields.Int(load_default=0, validate=validate.Range(min=0))
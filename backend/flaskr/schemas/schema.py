@@ -9,6 +9,12 @@ from flaskr.schemas.plain_schema import (
     PlainCategorySchema,
     PlainReviewSchema,
     PlainFavoriteSchema,
+    PlainFavoriteStatusSchema,
+    PlainPageQuerySchema,
+    PlainNearbyQuerySchema,
+    PlainMapQuerySchema,
+    PlainHeatmapQuerySchema,
+    PlainSearchQuerySchema,
 )
 
 
@@ -62,6 +68,30 @@ class UpdatePostSchema(PlainPostSchema):
     tag_id = fields.Int(required=False, load_only=True, data_key="tagId")
 
 
+class PageQuerySchema(PlainPageQuerySchema):
+    pass
+
+
+class FeedQuerySchema(PageQuerySchema):
+    with_stats = fields.Bool(load_default=False, data_key="withStats")
+
+
+class SearchQuerySchema(PlainSearchQuerySchema):
+    pass
+
+
+class NearbyQuerySchema(PlainNearbyQuerySchema):
+    pass
+
+
+class MapQuerySchema(PlainMapQuerySchema):
+    pass
+
+
+class HeatmapQuerySchema(PlainHeatmapQuerySchema):
+    pass
+
+
 class CategorySchema(PlainCategorySchema):
     pass
 
@@ -86,6 +116,10 @@ class FavoriteSchema(PlainFavoriteSchema):
     post_id = fields.Int(required=True, load_only=True, data_key="postId")
 
 
+class FavoriteStatusSchema(PlainFavoriteStatusSchema):
+    pass
+
+
 class UpdateFavoriteSchema(PlainFavoriteSchema):
     notes = fields.Str(required=False, allow_none=True)
     post_id = fields.Int(required=False, load_only=True, data_key="postId")
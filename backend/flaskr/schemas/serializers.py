@@ -0,0 +1,118 @@
+import json
+from datetime import datetime
+from operator import attrgetter
+from flask import current_app
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the stdlib encoder
+    orjson = None
+
+
+def compile_serializer(*fields):
+    """Build a row -> dict function for a fixed list of output fields.
+
+    Each field is (output_key, attribute_path) or (output_key,
+    attribute_path, converter). All attributes are fetched with a single
+    attrgetter call and converters only run on non-None values, which
+    avoids the per-field dispatch marshmallow does for every object. The
+    output keys match the data_key names used by the marshmallow schemas.
+    """
+    keys = tuple(field[0] for field in fields)
+    getter = attrgetter(*(field[1] for field in fields))
+    converters = tuple((field[0], field[2]) for field in fields if len(field) > 2)
+
+    def serialize(row):
+        data = dict(zip(keys, getter(row)))
+        for key, convert in converters:
+            value = data[key]
+            if value is not None:
+                data[key] = convert(value)
+        return data
+
+    return serialize
+
+
+def enum_value(value):
+    return value.value
+
+
+FEED_POST_FIELDS = (
+    ("id", "id"),
+    ("title", "title"),
+    ("content", "content"),
+    ("status", "status", enum_value),
+    ("image", "image"),
+    ("imageVariants", "image_variants"),
+    ("latitude", "latitude"),
+    ("longitude", "longitude"),
+    ("createdAt", "created_at", datetime.isoformat),
+    ("updatedAt", "updated_at", datetime.isoformat),
+    ("userId", "user_id"),
+    ("username", "username"),
+    ("tagName", "tag_name"),
+)
+
+serialize_feed_post = compile_serializer(*FEED_POST_FIELDS)
+
+serialize_feed_post_with_stats = compile_serializer(
+    *FEED_POST_FIELDS,
+    ("averageRating", "average_rating"),
+    ("totalReviews", "total_reviews"),
+    ("favorited", "favorited"),
+)
+
+serialize_search_result = compile_serializer(*FEED_POST_FIELDS, ("snippet", "snippet"))
+
+# Favorites are listed from one projected query: the post's columns come
+# prefixed with "post_" next to the favorite's own
+_serialize_favorite_fields = compile_serializer(
+    ("id", "id"),
+    ("notes", "notes"),
+    ("createdAt", "created_at", datetime.isoformat),
+    ("updatedAt", "updated_at", datetime.isoformat),
+)
+
+_serialize_favorite_post = compile_serializer(
+    *((key, f"post_{path}", *convert) for key, path, *convert in FEED_POST_FIELDS)
+)
+
+
+def serialize_favorite(row):
+    data = _serialize_favorite_fields(row)
+    data["post"] = _serialize_favorite_post(row)
+    return data
+
+
+serialize_review = compile_serializer(
+    ("id", "id"),
+    ("rating", "rating"),
+    ("comment", "comment"),
+    ("userId", "user_id"),
+    ("username", "username"),
+    ("createdAt", "created_at", datetime.isoformat),
+    ("updatedAt", "updated_at", datetime.isoformat),
+)
+
+# str() keeps the "TaskStatus.NATURA" form TaskSchema has always returned
+serialize_task = compile_serializer(
+    ("id", "id"),
+    ("title", "title"),
+    ("content", "content"),
+    ("status", "status", str),
+    ("createdAt", "created_at", datetime.isoformat),
+    ("tagName", "tag_name"),
+)
+
+
+def dumps(payload):
+    """Encode already-serialized data to JSON bytes, keys sorted like jsonify"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+
+
+def json_response(payload, status=200):
+    return current_app.response_class(
+        dumps(payload), status=status, mimetype="application/json"
+    )
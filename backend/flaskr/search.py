@@ -0,0 +1,90 @@
+import re
+from sqlalchemy import DDL, column, event, func, literal_column, table, text
+from flaskr.models.post_model import PostModel
+
+# External-content FTS5 index over posts.title and posts.content. The
+# triggers keep it in step with every write to posts, ORM or not; the
+# update trigger only fires when an indexed column changes.
+FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+        title, content,
+        content='posts', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, content ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO posts_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+)
+
+# Title matches weigh more than content matches in the bm25 ranking
+TITLE_WEIGHT = 10.0
+CONTENT_WEIGHT = 1.0
+SNIPPET_TOKENS = 12
+
+posts_fts = table("posts_fts", column("rowid"), column("title"), column("content"))
+_fts = literal_column("posts_fts")
+
+for statement in FTS_DDL:
+    event.listen(
+        PostModel.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
+
+
+def build_match_query(q):
+    """Turn free text into a safe FTS5 query.
+
+    Every word is quoted so FTS5 operators in user input are taken
+    literally; words are ANDed and the last one is a prefix match so
+    results show up while the user is still typing.
+    """
+    words = re.findall(r"\w+", q or "")
+    if not words:
+        return None
+
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_posts(stmt, match_query):
+    """Restrict a posts statement to FTS matches, adding rank and snippet"""
+    return (
+        stmt.join(posts_fts, posts_fts.c.rowid == PostModel.id)
+        .add_columns(
+            func.snippet(_fts, -1, "<mark>", "</mark>", "…", SNIPPET_TOKENS)
+            .label("snippet"),
+            func.bm25(_fts, TITLE_WEIGHT, CONTENT_WEIGHT).label("rank"),
+        )
+        .where(_fts.op("MATCH")(match_query))
+        .order_by(text("rank"), PostModel.id)
+    )
+
+
+def rebuild_index(session):
+    """Recreate the index (and its triggers) from the posts table"""
+    for statement in FTS_DDL:
+        session.execute(text(statement))
+    session.execute(text("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')"))
+    session.execute(text("INSERT INTO posts_fts(posts_fts) VALUES ('optimize')"))
+    session.commit()
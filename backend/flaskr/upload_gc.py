@@ -0,0 +1,130 @@
+import os
+import re
+import time
+from sqlalchemy import delete, select
+from flaskr.models.post_model import PostModel
+from flaskr.models.upload_model import UploadModel
+from flaskr.uploads import TEMP_PREFIX
+
+# <stem>_<width>.<ext> files written by flaskr/images.py next to <stem>.<ext>
+DERIVATIVE_NAME = re.compile(r"^(?P<stem>.+)_\d+\.(?:webp|jpg)$")
+
+
+def _originals(name, extensions):
+    """Names of the original uploads a file could belong to"""
+    match = DERIVATIVE_NAME.match(name)
+    if match is None:
+        return [name]
+    # A derivative lives as long as its original; an original can itself
+    # look like a derivative name, so keep it as a candidate too
+    return [name] + [f"{match['stem']}.{ext}" for ext in extensions]
+
+
+def _batches(folder, cutoff, batch_size):
+    """Yield lists of (name, size) for regular files last modified before cutoff"""
+    batch = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_mtime >= cutoff:
+                continue
+            batch.append((entry.name, stat.st_size))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def _referenced(session, names):
+    """The names among names that a post still uses.
+
+    uploads.ref_count decides for tracked files; files stored before the
+    uploads table existed have no row there and are looked up in
+    posts.image instead.
+    """
+    if not names:
+        return set()
+
+    counts = dict(
+        session.execute(
+            select(UploadModel.filename, UploadModel.ref_count).where(
+                UploadModel.filename.in_(names)
+            )
+        ).all()
+    )
+    referenced = {name for name, ref_count in counts.items() if ref_count > 0}
+
+    untracked = names - counts.keys()
+    if untracked:
+        referenced.update(
+            session.execute(
+                select(PostModel.image).where(PostModel.image.in_(untracked))
+            ).scalars()
+        )
+    return referenced
+
+
+def collect_orphans(session, folder, extensions, grace_seconds=3600, batch_size=500,
+                    max_deletes=None, dry_run=False):
+    """Delete files in the upload folder that no post refers to.
+
+    The folder is walked with scandir and checked batch_size files at a
+    time with IN queries on the uploads and posts.image keys, so neither
+    the directory listing nor a table is ever loaded whole. Files modified
+    within grace_seconds are left alone: they may belong to an upload whose
+    post is not committed yet (re-uploads of a stored file refresh its
+    mtime). Derivatives are kept while their original is referenced, and
+    abandoned temporary upload files are removed. Stops after max_deletes
+    files when set, so large backlogs can be worked off over several runs.
+
+    Returns {"scanned", "deleted", "bytesReclaimed"}.
+    """
+    cutoff = time.time() - grace_seconds
+    stats = {"scanned": 0, "deleted": 0, "bytesReclaimed": 0}
+
+    for batch in _batches(folder, cutoff, batch_size):
+        stats["scanned"] += len(batch)
+        candidates = {
+            name: _originals(name, extensions)
+            for name, _ in batch
+            if not name.startswith(TEMP_PREFIX)
+        }
+        referenced = _referenced(
+            session, {original for names in candidates.values() for original in names}
+        )
+
+        removed = []
+        for name, size in batch:
+            if referenced.intersection(candidates.get(name, ())):
+                continue
+            if max_deletes is not None and stats["deleted"] >= max_deletes:
+                break
+
+            path = os.path.join(folder, name)
+            try:
+                # Checked again right before deleting: it may have been reused
+                if os.stat(path).st_mtime >= cutoff:
+                    continue
+                if not dry_run:
+                    os.unlink(path)
+            except FileNotFoundError:
+                continue
+            removed.append(name)
+            stats["deleted"] += 1
+            stats["bytesReclaimed"] += size
+
+        if removed and not dry_run:
+            session.execute(
+                delete(UploadModel).where(
+                    UploadModel.filename.in_(removed), UploadModel.ref_count <= 0
+                )
+            )
+            session.commit()
+
+        if max_deletes is not None and stats["deleted"] >= max_deletes:
+            break
+
+    return stats
@@ -0,0 +1,264 @@
+import hashlib
+import mimetypes
+import os
+import re
+import tempfile
+from collections import Counter
+from datetime import datetime, timezone
+from flask import Request, current_app, request
+from flask_smorest import abort
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.dialects.sqlite import insert
+from werkzeug.utils import send_from_directory
+from flaskr.models.upload_model import UploadModel
+
+# Enough leading bytes to tell the accepted image types apart (the WebP
+# signature is the longest); shorter uploads cannot be a valid image
+SNIFF_BYTES = 12
+TEMP_PREFIX = ".upload-"
+
+# <sha256>.<ext> originals and their <sha256>_<width>.<ext> derivatives
+CONTENT_NAME = re.compile(r"^[0-9a-f]{64}(?:_\d+)?\.[a-z0-9]+$")
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+def format_size(size):
+    """Human-readable byte count, e.g. 512.0KB or 16.0MB"""
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f}MB"
+    return f"{size / 1024:.1f}KB"
+
+
+def sniff_image_type(head):
+    """Extension for the image type in the first bytes of a file, or None"""
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+class UploadStream:
+    """Disk-backed container for one uploaded file part.
+
+    Werkzeug writes the part into it chunk by chunk while parsing the form.
+    The size limit and the image type are checked on those chunks, so an
+    oversized or non-image upload is rejected as soon as it shows, and the
+    body is never held in memory. The SHA-256 of the content is computed
+    on the same pass. The data lands in a temporary file inside
+    UPLOAD_FOLDER that commit() renames into place atomically; otherwise
+    close() removes it.
+    """
+
+    def __init__(self, folder, max_size, allowed_extensions):
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.max_size = max_size
+        self.allowed_extensions = allowed_extensions
+        self.size = 0
+        self.extension = None
+        self._head = b""
+        self._sha256 = hashlib.sha256()
+        self._file = tempfile.NamedTemporaryFile(
+            dir=folder, prefix=TEMP_PREFIX, delete=False
+        )
+        self._committed = False
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > self.max_size:
+            self.close()
+            abort(413, message=f"File size exceeds {format_size(self.max_size)} limit")
+
+        if self.extension is None and len(self._head) < SNIFF_BYTES:
+            self._head += data[:SNIFF_BYTES - len(self._head)]
+            if len(self._head) == SNIFF_BYTES:
+                self._check_type()
+
+        self._sha256.update(data)
+        return self._file.write(data)
+
+    def _check_type(self):
+        self.extension = sniff_image_type(self._head)
+        if self.extension not in self.allowed_extensions:
+            self.close()
+            abort(400, message="Invalid file type. Allowed types: png, jpg, jpeg, gif, webp")
+
+    def commit(self):
+        """Move the upload into UPLOAD_FOLDER; returns the stored file name.
+
+        Files are named after their content, so uploading the same bytes
+        again reuses the stored file and keeps its URL.
+        """
+        if self.size == 0:
+            self.close()
+            abort(400, message="File is empty")
+        if self.size < SNIFF_BYTES:
+            # Too short to hold a full signature, let alone an image
+            self.close()
+            abort(400, message="Invalid file type. Allowed types: png, jpg, jpeg, gif, webp")
+
+        filename = f"{self._sha256.hexdigest()}.{self.extension}"
+        path = os.path.join(self.folder, filename)
+        if os.path.exists(path):
+            self.close()
+            # Fresh mtime keeps the orphan collector's grace period off it
+            os.utime(path)
+            return filename
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+        os.replace(self._file.name, path)
+        self._committed = True
+        return filename
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+        if not self._committed:
+            try:
+                os.unlink(self._file.name)
+            except FileNotFoundError:
+                pass
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def __getattr__(self, name):
+        # read/seek/tell/... for FileStorage and werkzeug
+        return getattr(self._file, name)
+
+
+class UploadRequest(Request):
+    """Request that streams uploaded files through UploadStream"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        config = current_app.config
+        stream = UploadStream(
+            config["UPLOAD_FOLDER"],
+            config["MAX_IMAGE_SIZE"],
+            config["ALLOWED_EXTENSIONS"],
+        )
+        # Parts parsed before a rejected one never reach request.files
+        self.__dict__.setdefault("_upload_streams", []).append(stream)
+        return stream
+
+    def close(self):
+        super().close()
+        for stream in self.__dict__.get("_upload_streams", ()):
+            stream.close()
+
+
+def save_image(file):
+    """Store an uploaded image from request.files; returns its file name or None"""
+    if not file or not file.filename:
+        return None
+
+    return file.stream.commit()
+
+
+def apply_upload_refs(session, added=(), removed=()):
+    """Adjust the reference counts of stored files in the current transaction.
+
+    added and removed are image file names gained and dropped by posts;
+    None entries are ignored. Rows that reach zero are kept for the
+    orphan collector, which deletes the file once it is old enough.
+    """
+    counts = Counter(name for name in added if name)
+    counts.subtract(name for name in removed if name)
+
+    gained = [
+        {
+            "filename": filename,
+            "size": upload_size(filename),
+            "ref_count": delta,
+            "created_at": datetime.now(timezone.utc),
+        }
+        for filename, delta in counts.items()
+        if delta > 0
+    ]
+    if gained:
+        stmt = insert(UploadModel)
+        session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["filename"],
+                set_={"ref_count": UploadModel.ref_count + stmt.excluded.ref_count},
+            ),
+            gained,
+        )
+
+    dropped = [
+        {"name": filename, "delta": -delta}
+        for filename, delta in counts.items()
+        if delta < 0
+    ]
+    if dropped:
+        session.connection().execute(
+            update(UploadModel)
+            .where(UploadModel.filename == bindparam("name"))
+            .values(ref_count=func.max(UploadModel.ref_count - bindparam("delta"), 0)),
+            dropped,
+        )
+
+
+def upload_size(filename):
+    try:
+        return os.path.getsize(os.path.join(current_app.config["UPLOAD_FOLDER"], filename))
+    except OSError:
+        return None
+
+
+def serve_upload(filename):
+    """Response for GET /uploads/<filename>, according to UPLOAD_SERVE_MODE.
+
+    Content-named files never change, so they get a year of immutable
+    caching and a strong ETag derived from the name; older uuid-named files
+    get UPLOAD_MAX_AGE. In "flask" mode the file is streamed by the worker
+    with conditional and Range support. "x-accel-redirect" (nginx) and
+    "x-sendfile" (Apache, lighttpd) only send headers and let the front
+    proxy transfer the bytes.
+    """
+    config = current_app.config
+    if filename.startswith("."):
+        abort(404)
+
+    match = CONTENT_NAME.match(filename)
+    max_age = IMMUTABLE_MAX_AGE if match else config["UPLOAD_MAX_AGE"]
+    etag = filename.rsplit(".", 1)[0] if match else True
+    mode = config["UPLOAD_SERVE_MODE"]
+
+    if mode == "x-accel-redirect":
+        if not os.path.isfile(os.path.join(config["UPLOAD_FOLDER"], filename)):
+            abort(404)
+        response = current_app.response_class(
+            mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        )
+        response.headers["X-Accel-Redirect"] = config["UPLOAD_ACCEL_PREFIX"] + filename
+        if match:
+            response.set_etag(etag)
+            response.make_conditional(request)
+    else:
+        # werkzeug's version: Flask's would override use_x_sendfile with USE_X_SENDFILE
+        response = send_from_directory(
+            config["UPLOAD_FOLDER"],
+            filename,
+            request.environ,
+            response_class=current_app.response_class,
+            etag=etag,
+            max_age=max_age,
+            conditional=True,
+            use_x_sendfile=mode == "x-sendfile",
+        )
+
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if match:
+        response.cache_control.immutable = True
+    return response
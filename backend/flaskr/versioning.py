@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+from itertools import chain
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+from flaskr.models.table_version_model import TableVersionModel
+
+
+def bump_versions(connection, table_names):
+    """Increment the change counter of each table on the given connection.
+
+    ORM writes are picked up automatically by the after_flush hook below;
+    code that writes through Core (bulk scripts) has to call this itself.
+    """
+    now = datetime.now(timezone.utc)
+    for table_name in sorted(set(table_names)):
+        result = connection.execute(
+            update(TableVersionModel)
+            .where(TableVersionModel.table_name == table_name)
+            .values(version=TableVersionModel.version + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            connection.execute(
+                insert(TableVersionModel).values(
+                    table_name=table_name, version=1, updated_at=now
+                )
+            )
+
+
+def get_versions(session, table_names):
+    """Return {table_name: (version, updated_at)} for the given tables"""
+    rows = session.execute(
+        select(
+            TableVersionModel.table_name,
+            TableVersionModel.version,
+            TableVersionModel.updated_at,
+        ).where(TableVersionModel.table_name.in_(table_names))
+    ).all()
+
+    versions = {table_name: (0, None) for table_name in table_names}
+    versions.update({row.table_name: (row.version, row.updated_at) for row in rows})
+    return versions
+
+
+def version_signature(versions):
+    """Stable string for get_versions() output, e.g. "posts=12;users=3" """
+    return ";".join(f"{name}={version}" for name, (version, _) in sorted(versions.items()))
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_flushed_tables(session, flush_context):
+    changed = {
+        obj.__table__.name
+        for obj in chain(session.new, session.deleted)
+    }
+    changed.update(
+        obj.__table__.name
+        for obj in session.dirty
+        if session.is_modified(obj, include_collections=False)
+    )
+
+    changed.discard(TableVersionModel.__tablename__)
+    if changed:
+        bump_versions(session.connection(), changed)
@@ -0,0 +1,53 @@
+"""
+Create the resized image derivatives for posts that do not have them yet,
+e.g. images uploaded before the pipeline existed or skipped while it was
+saturated.
+
+Run with: python generate_image_derivatives.py
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from sqlalchemy import select
+from flaskr import create_app
+from flaskr.db import db
+from flaskr.images import make_derivatives, store_variants
+from flaskr.models.post_model import PostModel
+
+
+def main():
+    app = create_app()
+
+    with app.app_context():
+        filenames = db.session.execute(
+            select(PostModel.image)
+            .where(PostModel.image.is_not(None), PostModel.image_variants.is_(None))
+            .distinct()
+        ).scalars().all()
+
+    print(f"{len(filenames)} images without derivatives")
+    done = failed = 0
+    with ProcessPoolExecutor(max_workers=max(1, app.config["IMAGE_WORKERS"])) as executor:
+        futures = {
+            executor.submit(
+                make_derivatives,
+                app.config["UPLOAD_FOLDER"],
+                filename,
+                app.config["IMAGE_DERIVATIVE_WIDTHS"],
+                app.config["IMAGE_DERIVATIVE_FORMATS"],
+                app.config["IMAGE_QUALITY"],
+            ): filename
+            for filename in filenames
+        }
+        for future in as_completed(futures):
+            filename = futures[future]
+            try:
+                store_variants(app, filename, future.result())
+                done += 1
+            except Exception as e:
+                failed += 1
+                print(f"  {filename}: {e}")
+
+    print(f"Created derivatives for {done} images, {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -51,6 +51,19 @@ def get_metadata():
     return target_db.metadata
 
 
+# FTS5 and R*Tree virtual tables, and the shadow tables SQLite keeps for
+# them, are created by raw DDL (flaskr/search.py, flaskr/geo.py) and the
+# migrations; they are not in the models' metadata, so autogenerate must
+# not see them or it would emit drop_table for each
+VIRTUAL_TABLE_PREFIXES = ("posts_fts", "posts_geo")
+
+
+def include_name(name, type_, parent_names):
+    if type_ == "table":
+        return not name.startswith(VIRTUAL_TABLE_PREFIXES)
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +78,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_name=include_name
     )
 
     with context.begin_transaction():
@@ -93,6 +107,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_name", include_name)
 
     connectable = get_engine()
 
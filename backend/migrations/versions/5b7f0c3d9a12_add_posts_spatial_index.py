@@ -0,0 +1,59 @@
+"""add posts spatial index
+
+Revision ID: 5b7f0c3d9a12
+Revises: c4a9e5d2f871
+Create Date: 2026-10-18 14:22:09.518320
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7f0c3d9a12'
+down_revision = 'c4a9e5d2f871'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE VIRTUAL TABLE posts_geo USING rtree(
+            id, min_lat, max_lat, min_lng, max_lng
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER posts_geo_ai AFTER INSERT ON posts BEGIN
+            INSERT INTO posts_geo
+            SELECT new.id, new.latitude, new.latitude, new.longitude, new.longitude
+            WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER posts_geo_ad AFTER DELETE ON posts BEGIN
+            DELETE FROM posts_geo WHERE id = old.id;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER posts_geo_au AFTER UPDATE OF latitude, longitude ON posts BEGIN
+            DELETE FROM posts_geo WHERE id = old.id;
+            INSERT INTO posts_geo
+            SELECT new.id, new.latitude, new.latitude, new.longitude, new.longitude
+            WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL;
+        END
+    """)
+
+    # Index the posts that already have coordinates
+    op.execute("""
+        INSERT INTO posts_geo
+        SELECT id, latitude, latitude, longitude, longitude
+        FROM posts
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS posts_geo_au")
+    op.execute("DROP TRIGGER IF EXISTS posts_geo_ad")
+    op.execute("DROP TRIGGER IF EXISTS posts_geo_ai")
+    op.execute("DROP TABLE IF EXISTS posts_geo")
@@ -0,0 +1,56 @@
+"""add posts full text index
+
+Revision ID: c4a9e5d2f871
+Revises: 8e2d41b7c0f3
+Create Date: 2026-10-18 13:05:47.204116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a9e5d2f871'
+down_revision = '8e2d41b7c0f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE VIRTUAL TABLE posts_fts USING fts5(
+            title, content,
+            content='posts', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER posts_fts_ai AFTER INSERT ON posts BEGIN
+            INSERT INTO posts_fts(rowid, title, content)
+            VALUES (new.id, new.title, new.content);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER posts_fts_ad AFTER DELETE ON posts BEGIN
+            INSERT INTO posts_fts(posts_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER posts_fts_au AFTER UPDATE OF title, content ON posts BEGIN
+            INSERT INTO posts_fts(posts_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO posts_fts(rowid, title, content)
+            VALUES (new.id, new.title, new.content);
+        END
+    """)
+
+    # Index the posts that already exist
+    op.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS posts_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS posts_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS posts_fts_ai")
+    op.execute("DROP TABLE IF EXISTS posts_fts")
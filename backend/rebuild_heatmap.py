@@ -0,0 +1,27 @@
+"""
+Recount the heatmap_cells rollup (posts per geohash cell) from the posts
+table, e.g. after bulk imports that bypass PostController.
+
+Run with: python rebuild_heatmap.py
+"""
+from flaskr import create_app
+from flaskr.db import db
+from flaskr.heatmap import HEATMAP_PRECISIONS, rebuild_heatmap
+from flaskr.models.heatmap_cell_model import HeatmapCellModel
+
+
+def main():
+    app = create_app()
+
+    with app.app_context():
+        located = rebuild_heatmap(db.session)
+        cells = db.session.query(HeatmapCellModel).count()
+
+    print(
+        f"Rebuilt heatmap from {located} located posts: {cells} cells "
+        f"at precisions {', '.join(map(str, HEATMAP_PRECISIONS))}"
+    )
+
+
+if __name__ == "__main__":
+    main()
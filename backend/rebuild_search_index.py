@@ -0,0 +1,21 @@
+"""
+Rebuild the posts full-text index (posts_fts) from the posts table.
+Creates the index and its triggers first if they are missing.
+
+Run with: python rebuild_search_index.py
+"""
+from flaskr import create_app
+from flaskr.db import db
+from flaskr.search import rebuild_index
+
+
+def main():
+    app = create_app()
+
+    with app.app_context():
+        rebuild_index(db.session)
+        print("Rebuilt posts full-text index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Backfill or repair the stored review aggregates on posts
+(rating_sum, rating_count, rating_avg) from the reviews table.
+
+Run with: python reconcile_ratings.py [--check]
+"""
+import sys
+from flaskr import create_app
+from flaskr.db import db
+from flaskr.ratings import reconcile_ratings
+
+
+def main():
+    check_only = "--check" in sys.argv[1:]
+
+    app = create_app()
+
+    with app.app_context():
+        drifted = reconcile_ratings(db.session, fix=not check_only)
+
+    if not drifted:
+        print("All post rating aggregates match their reviews")
+    elif check_only:
+        print(f"{len(drifted)} posts have drifted rating aggregates: {drifted[:20]}")
+        sys.exit(1)
+    else:
+        print(f"Recomputed rating aggregates for {len(drifted)} posts")
+
+
+if __name__ == "__main__":
+    main()
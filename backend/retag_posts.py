@@ -0,0 +1,54 @@
+"""
+Assign tags to posts from their status (NATURA → nature tags, URBAN → city
+tags, RURAL → rural tags; see TAG_MAPPING in flaskr/retag.py).
+
+Only untagged posts are changed unless --all is given. Work is committed
+per chunk of posts; to resume an interrupted --all run, pass the last id
+it reported as --start-after.
+
+Run with: python retag_posts.py [--all] [--start-after ID] [--chunk-size N]
+"""
+import argparse
+import sys
+import time
+from sqlalchemy import func, select
+from flaskr import create_app
+from flaskr.db import db
+from flaskr.models.post_model import PostModel
+from flaskr.retag import retag_posts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--all", action="store_true", help="retag every post, not only untagged ones")
+    parser.add_argument("--start-after", type=int, default=0, help="skip posts with ids up to this one")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    app = create_app()
+    started = time.perf_counter()
+
+    def progress(last_id, updated):
+        print(f"  up to post #{last_id}: {updated} posts tagged ({time.perf_counter() - started:.1f}s)")
+
+    with app.app_context():
+        updated = retag_posts(
+            db.session,
+            only_untagged=not args.all,
+            start_after=args.start_after,
+            chunk_size=args.chunk_size,
+            progress=progress,
+        )
+        if updated is None:
+            print("No tags found in database! Please create tags first (seed_tags.py).")
+            sys.exit(1)
+
+        untagged = db.session.execute(
+            select(func.count()).select_from(PostModel).where(PostModel.tag_id.is_(None))
+        ).scalar()
+
+    print(f"Tagged {updated} posts in {time.perf_counter() - started:.1f}s; {untagged} posts without tags")
+
+
+if __name__ == "__main__":
+    main()
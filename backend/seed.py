@@ -1,6 +1,6 @@
 from flaskr import create_app
+from flaskr.bulk import bulk_insert, bulk_load
 from flaskr.models.tag_model import TagModel
-from flaskr.db import db
 
 
 def seed_tags():
@@ -30,18 +30,14 @@ def seed_tags():
 
         app = create_app()
 
-        with app.app_context():
-            for tag_name in tag_names:
-                data = {"name": tag_name}
+        with app.app_context(), bulk_load() as connection:
+            inserted = bulk_insert(
+                connection, TagModel, ({"name": tag_name} for tag_name in tag_names)
+            )
 
-                new_tag = TagModel(**data)
-
-                db.session.add(new_tag)
-                db.session.commit()
-
-            print(f"Inserted new tags")
+        print(f"Inserted {inserted} new tags")
     except Exception as err:
-        db.session.rollback()
+        # bulk_load rolled the whole batch back
         print(f"Error while seeding: {err}")
 
 
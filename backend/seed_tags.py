@@ -1,5 +1,5 @@
 from application import create_app
-from flaskr.db import db
+from flaskr.bulk import bulk_insert, bulk_load
 from flaskr.models.tag_model import TagModel
 
 app = create_app()
@@ -10,21 +10,11 @@ with app.app_context():
 
     if len(existing_tags) == 0:
         # Create default tags
-        default_tags = [
-            TagModel(name="Mountain"),
-            TagModel(name="Beach"),
-            TagModel(name="City"),
-            TagModel(name="Forest"),
-            TagModel(name="Desert"),
-            TagModel(name="Lake"),
-            TagModel(name="River"),
-            TagModel(name="Park"),
-        ]
+        default_tags = ["Mountain", "Beach", "City", "Forest", "Desert", "Lake", "River", "Park"]
 
-        for tag in default_tags:
-            db.session.add(tag)
+        with bulk_load() as connection:
+            created = bulk_insert(connection, TagModel, ({"name": name} for name in default_tags))
 
-        db.session.commit()
-        print(f"Created {len(default_tags)} default tags successfully!")
+        print(f"Created {created} default tags successfully!")
     else:
         print(f"Tags already exist ({len(existing_tags)} tags found). Skipping...")
@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from flaskr import create_app
+from flaskr.db import db
+from flaskr.models.user_model import UserModel
+
+
+@pytest.fixture
+def app(tmp_path):
+    class TestingConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + str(tmp_path / "test.db")
+        UPLOAD_FOLDER = str(tmp_path / "uploads")
+        JWT_SECRET_KEY = "test-secret-key-that-is-long-enough"
+        IMAGE_WORKERS = 0
+        QUERY_STATS_ENABLED = True
+
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        db.session.add(UserModel(username="alice", email="alice@example.com", password="-"))
+        db.session.commit()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_for(app):
+    """Authorization header for a user id"""
+
+    def header(user_id):
+        with app.app_context():
+            return {"Authorization": f"Bearer {create_access_token(identity=str(user_id))}"}
+
+    return header
+
+
+@pytest.fixture
+def auth(auth_for):
+    """Authorization header for alice, user 1"""
+    return auth_for(1)
@@ -0,0 +1,50 @@
+from flaskr.cache import TTLCache, feed_cache
+from flaskr.controllers.post_controller import PostController
+from flaskr.db import db
+from flaskr.models.post_model import PostModel
+
+
+def test_expired_entries_are_misses():
+    cache = TTLCache(ttl=-1)
+    cache.set("key", "value")
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1 and cache.get("b") is None and cache.get("c") == 3
+
+
+def test_value_computed_before_an_invalidation_is_dropped():
+    cache = TTLCache()
+
+    def compute():
+        cache.invalidate()
+        return "stale"
+
+    assert cache.get_or_set("key", compute) == "stale"
+    assert cache.get("key") is None
+
+
+def test_write_changes_the_feed_cache_key(app, client, auth):
+    with app.app_context():
+        before = PostController._feed_cache_key("all", None, None)
+    client.post("/api/v1/posts", data={"title": "Lake", "content": "Calm", "status": "NATURA"}, headers=auth)
+    with app.app_context():
+        assert PostController._feed_cache_key("all", None, None) != before
+
+
+def test_feed_sees_writes_that_skip_the_local_invalidation(app, client, auth):
+    assert client.get("/api/v1/posts", headers=auth).json == []
+
+    # As another worker would: the write reaches the database only
+    with app.app_context():
+        db.session.add(PostModel(title="Lake", content="Calm", user_id=1))
+        db.session.commit()
+
+    assert feed_cache.stats()["size"] == 1
+    assert [post["title"] for post in client.get("/api/v1/posts", headers=auth).json] == ["Lake"]
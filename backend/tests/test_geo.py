@@ -0,0 +1,54 @@
+import pytest
+from flaskr.db import db
+from flaskr.geo import haversine_km, radius_bbox
+from flaskr.models.post_model import PostModel
+
+
+def test_box_away_from_the_edges_is_one_range():
+    min_lat, max_lat, lng_ranges = radius_bbox(41.0, -8.0, 10)
+    assert min_lat < 41.0 < max_lat
+    [(min_lng, max_lng)] = lng_ranges
+    assert min_lng == pytest.approx(-8.0 - (max_lng + 8.0))
+
+
+@pytest.mark.parametrize("lng", [179.9, -179.9])
+def test_box_across_the_antimeridian_is_split(lng):
+    _, _, lng_ranges = radius_bbox(0.0, lng, 50)
+    assert len(lng_ranges) == 2
+    (east_min, east_max), (west_min, west_max) = lng_ranges
+    assert east_max == 180.0 and west_min == -180.0
+    assert -180.0 < west_max < 0 < east_min < 180.0
+    # Both neighbours across the line fall in the box
+    for point in (179.95, -179.95):
+        assert any(low <= point <= high for low, high in lng_ranges)
+
+
+@pytest.mark.parametrize("lat", [89.9, -89.9])
+def test_box_reaching_a_pole_spans_every_longitude(lat):
+    min_lat, max_lat, lng_ranges = radius_bbox(lat, 10.0, 50)
+    assert -90.0 <= min_lat < max_lat <= 90.0
+    assert 90.0 in (max_lat, -min_lat)
+    assert lng_ranges == [(-180.0, 180.0)]
+
+
+def test_distance_across_the_antimeridian():
+    assert haversine_km(0.0, 179.9, 0.0, -179.9) == pytest.approx(22.24, abs=0.01)
+
+
+def test_nearby_orders_by_distance_within_the_radius(app, client, auth):
+    # Two degrees of longitude at the equator are ~222 km
+    spots = {"east": 179.95, "west": -179.8, "near": 179.5, "far": 178.0, "away": 170.0}
+    with app.app_context():
+        db.session.add_all(
+            PostModel(title=name, content="-", latitude=0.0, longitude=lng, user_id=1)
+            for name, lng in spots.items()
+        )
+        db.session.commit()
+
+    response = client.get("/api/v1/posts/nearby?lat=0&lng=179.9&radius=250", headers=auth)
+    posts = response.json["posts"]
+    assert [post["title"] for post in posts] == ["east", "west", "near", "far"]
+    assert [post["distanceKm"] for post in posts] == sorted(post["distanceKm"] for post in posts)
+
+    limited = client.get("/api/v1/posts/nearby?lat=0&lng=179.9&radius=250&limit=2", headers=auth)
+    assert [post["title"] for post in limited.json["posts"]] == ["east", "west"]
@@ -0,0 +1,37 @@
+from sqlalchemy import select
+from flaskr.db import db
+from flaskr.heatmap import HEATMAP_PRECISIONS, apply_heatmap_changes, encode_geohash
+from flaskr.models.heatmap_cell_model import HeatmapCellModel
+
+PORTO = (41.15, -8.61)
+LISBON = (38.72, -9.14)
+
+
+def cells():
+    return dict(
+        ((precision, geohash), count)
+        for precision, geohash, count in db.session.execute(
+            select(HeatmapCellModel.precision, HeatmapCellModel.geohash, HeatmapCellModel.count)
+        )
+    )
+
+
+def test_geohash():
+    assert encode_geohash(42.605, -5.603, 5) == "ezs42"
+
+
+def test_cells_follow_posts_and_empty_ones_are_dropped(app):
+    with app.app_context():
+        apply_heatmap_changes(db.session, added=[PORTO, PORTO, LISBON])
+        porto = encode_geohash(*PORTO, max(HEATMAP_PRECISIONS))
+        assert cells()[(6, porto)] == 2
+        assert len(cells()) == 2 * len(HEATMAP_PRECISIONS) - 1  # both share the 1-char cell
+
+        apply_heatmap_changes(db.session, removed=[PORTO])
+        assert cells()[(6, porto)] == 1
+
+        apply_heatmap_changes(db.session, removed=[PORTO], added=[(None, 1.0)])
+        remaining = cells()
+        assert (6, porto) not in remaining
+        assert len(remaining) == len(HEATMAP_PRECISIONS)
+        assert all(count == 1 for count in remaining.values())
@@ -0,0 +1,54 @@
+from flaskr.controllers.tag_controller import TagController
+from flaskr.db import db
+from flaskr.models.user_model import UserModel
+
+
+def test_matching_etag_answers_304_without_running_the_view(client, monkeypatch):
+    first = client.get("/api/v1/tags")
+    assert first.status_code == 200 and first.headers["ETag"]
+
+    def not_called():
+        raise AssertionError("view ran for a matching If-None-Match")
+
+    monkeypatch.setattr(TagController, "get_all", not_called)
+    second = client.get("/api/v1/tags", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+
+def test_write_changes_the_etag(client, auth):
+    before = client.get("/api/v1/tags").headers["ETag"]
+    assert client.post("/api/v1/tags", json={"name": "River"}, headers=auth).status_code == 201
+
+    after = client.get("/api/v1/tags", headers={"If-None-Match": before})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before
+    assert [tag["name"] for tag in after.json] == ["River"]
+
+
+def test_last_modified_alone_never_answers_304(client, auth):
+    first = client.get("/api/v1/tags")
+    assert first.headers["Last-Modified"]
+
+    # A write in the same second keeps Last-Modified but must still be seen
+    client.post("/api/v1/tags", json={"name": "River"}, headers=auth)
+    for since in (first.headers["Last-Modified"], "Fri, 01 Jan 2100 00:00:00 GMT"):
+        response = client.get("/api/v1/tags", headers={"If-Modified-Since": since})
+        assert response.status_code == 200
+
+
+def test_plain_feed_etag_is_shared_and_ignores_reviews(app, client, auth, auth_for):
+    with app.app_context():
+        db.session.add(UserModel(username="bob", email="bob@example.com", password="-"))
+        db.session.commit()
+    bob = auth_for(2)
+    client.post("/api/v1/posts", data={"title": "Lake", "content": "Calm", "status": "NATURA"}, headers=auth)
+
+    plain = client.get("/api/v1/posts", headers=auth).headers["ETag"]
+    stats = client.get("/api/v1/posts?withStats=true", headers=auth).headers["ETag"]
+    assert client.get("/api/v1/posts", headers=bob).headers["ETag"] == plain
+    assert client.get("/api/v1/posts?withStats=true", headers=bob).headers["ETag"] != stats
+
+    client.post("/api/v1/posts/1/reviews", json={"rating": 5, "comment": "Lovely"}, headers=bob)
+    assert client.get("/api/v1/posts", headers=auth).headers["ETag"] == plain
+    assert client.get("/api/v1/posts?withStats=true", headers=auth).headers["ETag"] != stats
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from flaskr.db import db
+from flaskr.models.favorite_model import FavoriteModel
+from flaskr.models.post_model import PostModel, PostStatus
+from flaskr.models.review_model import ReviewModel
+from flaskr.models.tag_model import TagModel
+from flaskr.models.user_model import UserModel
+from flaskr.query_stats import assert_query_budget
+
+USERS = 10
+POSTS = 40
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture(autouse=True)
+def seeded(app):
+    """Users and tags, and posts that each have several reviews and favorites"""
+    with app.app_context():
+        tags = [TagModel(name=name) for name in ("River", "City", "Farm")]
+        users = [db.session.get(UserModel, 1)] + [
+            UserModel(username=f"user{i}", email=f"user{i}@example.com", password="-")
+            for i in range(2, USERS + 1)
+        ]
+        db.session.add_all(tags + users)
+        db.session.flush()
+
+        for i in range(POSTS):
+            created_at = START + timedelta(hours=i)
+            post = PostModel(
+                title=f"Post {i}",
+                content="Somewhere worth a visit.",
+                status=list(PostStatus)[i % len(PostStatus)],
+                latitude=41.0 + (i % 8) * 0.5,
+                longitude=-8.0 + (i // 8) * 0.5,
+                user_id=users[i % USERS].id,
+                tag_id=tags[i % len(tags)].id,
+                created_at=created_at,
+                updated_at=created_at,
+            )
+            db.session.add(post)
+            db.session.flush()
+            for user in users[:5]:
+                db.session.add(ReviewModel(rating=4, comment="Nice", user_id=user.id, post_id=post.id))
+                db.session.add(FavoriteModel(user_id=user.id, post_id=post.id))
+        db.session.commit()
+
+
+def test_feed(client, auth):
+    with assert_query_budget(4, max_repeats=2):
+        response = client.get("/api/v1/posts?limit=20&withStats=true", headers=auth)
+    assert response.status_code == 200
+
+
+def test_user_feed(client, auth):
+    with assert_query_budget(4, max_repeats=2):
+        response = client.get("/api/v1/posts/user?limit=20", headers=auth)
+    assert response.status_code == 200
+
+
+def test_favorites(client, auth):
+    with assert_query_budget(4, max_repeats=2):
+        response = client.get("/api/v1/favorites", headers=auth)
+    assert response.status_code == 200
+    assert len(response.json) == POSTS
+
+
+def test_favorites_pages(client, auth):
+    with assert_query_budget(4, max_repeats=2):
+        first = client.get("/api/v1/favorites?limit=15", headers=auth)
+    with assert_query_budget(4, max_repeats=2):
+        second = client.get(
+            "/api/v1/favorites", query_string={"limit": 15, "cursor": first.json["nextCursor"]}, headers=auth
+        )
+    assert len(first.json["favorites"]) == len(second.json["favorites"]) == 15
+
+
+def test_reviews(client, auth):
+    with assert_query_budget(4, max_repeats=2):
+        response = client.get("/api/v1/posts/1/reviews", headers=auth)
+    assert response.status_code == 200
+    assert response.json["totalReviews"] == 5
+
+
+def test_map(client, auth):
+    # A viewport over several tiles at a zoom that clusters the posts
+    with assert_query_budget(4, max_repeats=2):
+        response = client.get("/api/v1/posts/map?bbox=-10,38,0,46&zoom=8", headers=auth)
+    assert response.status_code == 200
+    assert response.json["clusters"] or response.json["points"]
+
+
+def test_failed_statement_leaves_no_start_time(app):
+    with app.app_context():
+        with pytest.raises(OperationalError):
+            db.session.execute(text("SELECT * FROM missing_table"))
+        db.session.rollback()
+        assert not db.session.connection().info.get("query_start")
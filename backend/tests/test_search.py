@@ -0,0 +1,44 @@
+from sqlalchemy import select
+from flaskr.db import db
+from flaskr.models.post_model import PostModel
+from flaskr.search import build_match_query, search_posts
+
+
+def test_words_are_quoted_and_the_last_is_a_prefix():
+    assert build_match_query("old  river") == '"old" "river"*'
+    assert build_match_query("Café") == '"Café"*'
+
+
+def test_operators_and_punctuation_are_taken_literally():
+    assert build_match_query('title:x OR "y" NEAR(z)') == '"title" "x" "OR" "y" "NEAR" "z"*'
+    assert build_match_query("AND") == '"AND"*'
+
+
+def test_input_without_words_gives_no_query():
+    for q in ("", None, "   ", '*"-():^+'):
+        assert build_match_query(q) is None
+
+
+def matches(word):
+    return db.session.execute(
+        search_posts(select(PostModel.id), build_match_query(word))
+    ).scalars().all()
+
+
+def test_triggers_follow_inserts_updates_and_deletes(app):
+    with app.app_context():
+        post = PostModel(title="Quiet waterfall", content="Reached by a steep trail", user_id=1)
+        db.session.add(post)
+        db.session.commit()
+        assert matches("waterfall") == [post.id]
+        assert matches("stee") == [post.id]
+
+        post.title = "Quiet lake"
+        db.session.commit()
+        assert matches("waterfall") == []
+        assert matches("lake") == [post.id]
+
+        db.session.delete(post)
+        db.session.commit()
+        assert matches("lake") == []
+        assert matches("trail") == []
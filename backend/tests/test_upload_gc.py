@@ -0,0 +1,108 @@
+import os
+import time
+
+import pytest
+from flaskr.db import db
+from flaskr.models.post_model import PostModel
+from flaskr.models.upload_model import UploadModel
+from flaskr.upload_gc import collect_orphans
+
+EXTENSIONS = {"png", "jpg", "jpeg", "gif", "webp"}
+HOUR = 3600
+
+
+@pytest.fixture
+def folder(app):
+    folder = app.config["UPLOAD_FOLDER"]
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def touch(folder, name, age=2 * HOUR):
+    path = os.path.join(folder, name)
+    with open(path, "wb") as f:
+        f.write(b"x" * 10)
+    past = time.time() - age
+    os.utime(path, (past, past))
+
+
+def track(app, ref_counts):
+    with app.app_context():
+        db.session.add_all(
+            UploadModel(filename=name, ref_count=count) for name, count in ref_counts.items()
+        )
+        db.session.commit()
+
+
+def collect(app, folder, **kwargs):
+    with app.app_context():
+        return collect_orphans(db.session, folder, EXTENSIONS, grace_seconds=HOUR, **kwargs)
+
+
+def test_recent_files_are_left_for_the_grace_period(app, folder):
+    touch(folder, "old.png")
+    touch(folder, "new.png", age=60)
+
+    stats = collect(app, folder)
+    assert os.listdir(folder) == ["new.png"]
+    assert stats == {"scanned": 1, "deleted": 1, "bytesReclaimed": 10}
+
+
+def test_reference_counts_decide_and_rows_go_with_their_files(app, folder):
+    for name in ("used.png", "dropped.png"):
+        touch(folder, name)
+    track(app, {"used.png": 1, "dropped.png": 0})
+
+    collect(app, folder)
+    assert os.listdir(folder) == ["used.png"]
+    with app.app_context():
+        assert db.session.query(UploadModel.filename).scalar() == "used.png"
+
+
+def test_files_from_before_the_uploads_table_fall_back_to_posts(app, folder):
+    touch(folder, "legacy.jpg")
+    touch(folder, "stray.jpg")
+    with app.app_context():
+        db.session.add(PostModel(title="Lake", content="-", image="legacy.jpg", user_id=1))
+        db.session.commit()
+
+    collect(app, folder)
+    assert os.listdir(folder) == ["legacy.jpg"]
+
+
+def test_derivatives_live_as_long_as_their_original(app, folder):
+    for name in ("abc.png", "abc_600.webp", "abc_600.jpg", "def_600.webp"):
+        touch(folder, name)
+    track(app, {"abc.png": 1})
+
+    collect(app, folder)
+    assert sorted(os.listdir(folder)) == ["abc.png", "abc_600.jpg", "abc_600.webp"]
+
+
+def test_abandoned_temporary_uploads_are_removed(app, folder):
+    touch(folder, ".upload-abandoned")
+    touch(folder, ".upload-in-progress", age=60)
+    touch(folder, "abc_600.webp.tmp")
+
+    collect(app, folder)
+    assert os.listdir(folder) == [".upload-in-progress"]
+
+
+def test_max_deletes_stops_early(app, folder):
+    for i in range(5):
+        touch(folder, f"orphan{i}.png")
+
+    stats = collect(app, folder, max_deletes=2, batch_size=2)
+    assert stats["deleted"] == 2
+    assert len(os.listdir(folder)) == 3
+
+
+def test_dry_run_only_reports(app, folder):
+    touch(folder, "orphan.png")
+    track(app, {"orphan.png": 0})
+
+    stats = collect(app, folder, dry_run=True)
+    assert stats["deleted"] == 1
+    assert os.listdir(folder) == ["orphan.png"]
+    with app.app_context():
+        assert db.session.get(UploadModel, "orphan.png") is not None
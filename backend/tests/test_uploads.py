@@ -0,0 +1,61 @@
+import io
+import os
+
+from flaskr.db import db
+from flaskr.models.post_model import PostModel
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 200
+
+
+def upload(client, auth, content, filename):
+    return client.post(
+        "/api/v1/posts",
+        data={
+            "title": "Lake",
+            "content": "Calm",
+            "status": "NATURA",
+            "image": (io.BytesIO(content), filename),
+        },
+        headers=auth,
+        content_type="multipart/form-data",
+    )
+
+
+def stored_files(app):
+    return sorted(os.listdir(app.config["UPLOAD_FOLDER"]))
+
+
+def post_count(app):
+    with app.app_context():
+        return db.session.query(PostModel).count()
+
+
+def test_non_image_renamed_to_an_image_is_rejected(app, client, auth):
+    response = upload(client, auth, b"%PDF-1.7\n" + b"x" * 200, "photo.png")
+    assert response.status_code == 400
+    assert stored_files(app) == []
+    assert post_count(app) == 0
+
+
+def test_upload_shorter_than_a_signature_is_rejected(app, client, auth):
+    response = upload(client, auth, PNG[:4], "photo.png")
+    assert response.status_code == 400
+    assert stored_files(app) == []
+
+
+def test_oversized_upload_is_rejected_without_leftovers(app, client, auth):
+    app.config["MAX_IMAGE_SIZE"] = 1024
+    response = upload(client, auth, PNG + b"\x00" * 4096, "photo.png")
+    assert response.status_code == 413
+    assert response.json["message"] == "File size exceeds 1.0KB limit"
+    assert stored_files(app) == []
+    assert post_count(app) == 0
+
+
+def test_sniffed_type_overrides_the_client_extension(app, client, auth):
+    assert upload(client, auth, PNG, "photo.jpg").status_code == 201
+
+    with app.app_context():
+        image = db.session.query(PostModel.image).scalar()
+    assert image.endswith(".png")
+    assert stored_files(app) == [image]
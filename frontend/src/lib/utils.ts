@@ -1,6 +1,29 @@
 import { clsx, type ClassValue } from "clsx";
 import { twMerge } from "tailwind-merge";
+import { ENV } from "@/config/env";
+import { ImageVariants } from "@/types/types";
 
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs));
 }
+
+// src/srcSet for a post image: the WebP derivatives when they exist,
+// otherwise the original upload (derivatives are still being generated)
+export function imageSources(image: string, variants?: ImageVariants | null) {
+  const original = `${ENV.UPLOADS_URL}/${image}`;
+  if (!variants) {
+    return { src: original };
+  }
+
+  const widths = Object.keys(variants).sort((a, b) => Number(a) - Number(b));
+  const srcSet = widths
+    .filter((width) => variants[width].webp)
+    .map((width) => `${ENV.UPLOADS_URL}/${variants[width].webp} ${width}w`)
+    .join(", ");
+  const fallback = variants["600"]?.jpeg;
+
+  return {
+    src: fallback ? `${ENV.UPLOADS_URL}/${fallback}` : original,
+    srcSet: srcSet || undefined,
+  };
+}
@@ -1,5 +1,5 @@
 import { Favorite } from "@/types/types";
-import { ENV } from "@/config/env";
+import { imageSources } from "@/lib/utils";
 import { formatDistanceToNow } from "date-fns";
 import { ShowPostDialog } from "@/routes/posts/_components/show-post-dialog";
 import { Card, CardContent, CardHeader } from "@/components/ui/card";
@@ -96,7 +96,8 @@ export const FavoriteCard = ({ favorite }: FavoriteCardProps) => {
         {favorite.post.image && (
           <div className="mb-4 overflow-hidden rounded-lg group">
             <img
-              src={`${ENV.UPLOADS_URL}/${favorite.post.image}`}
+              {...imageSources(favorite.post.image, favorite.post.imageVariants)}
+              sizes="(min-width: 768px) 50vw, 100vw"
               alt={favorite.post.title}
               className="w-full h-64 object-cover rounded-lg transition-transform duration-300 group-hover:scale-105"
             />
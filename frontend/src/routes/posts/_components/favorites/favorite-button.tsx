@@ -12,17 +12,28 @@ import { cn } from "@/lib/utils";
 interface Props {
   postId: number;
   variant?: "default" | "icon";
+  // From a batch status lookup: the favorite's id, null when not favorited,
+  // undefined when unknown (the post is then checked on its own)
+  favoriteId?: number | null;
 }
 
-export const FavoriteButton = ({ postId, variant = "default" }: Props) => {
+export const FavoriteButton = ({
+  postId,
+  variant = "default",
+  favoriteId,
+}: Props) => {
   const token = useAuthStore((s) => s.token);
-  const { data, isLoading } = useCheckIfPostIsFavoritedQuery(postId);
+  const { data, isLoading } = useCheckIfPostIsFavoritedQuery(
+    postId,
+    favoriteId === undefined,
+  );
   const { mutate: createFavorite, isPending: isCreating } =
     useCreateFavoriteMutation();
   const { mutate: deleteFavorite, isPending: isDeleting } =
     useDeleteFavoriteByPostMutation();
 
-  const isFavorited = data && "id" in data;
+  const isFavorited =
+    favoriteId !== undefined ? favoriteId !== null : data && "id" in data;
   const isPending = isCreating || isDeleting;
 
   const handleToggleFavorite = () => {
@@ -1,5 +1,5 @@
 import { Post } from "@/types/types";
-import { ENV } from "@/config/env";
+import { imageSources } from "@/lib/utils";
 import { formatDistanceToNow } from "date-fns";
 import { EditPostDialog } from "./edit-post-dialog";
 import { DeletePostDialog } from "./delete-post-dialog";
@@ -9,9 +9,10 @@ import { Card, CardContent, CardHeader } from "@/components/ui/card";
 type PostCardProps = {
   post: Post;
   showActions?: boolean;
+  favoriteId?: number | null;
 };
 
-export const PostCard = ({ post, showActions = false }: PostCardProps) => {
+export const PostCard = ({ post, showActions = false, favoriteId }: PostCardProps) => {
   // Safely parse date with fallback
   let timeAgo = "recently";
   try {
@@ -51,7 +52,8 @@ export const PostCard = ({ post, showActions = false }: PostCardProps) => {
         {post.image && (
           <div className="mb-4 overflow-hidden rounded-lg group">
             <img
-              src={`${ENV.UPLOADS_URL}/${post.image}`}
+              {...imageSources(post.image, post.imageVariants)}
+              sizes="(min-width: 768px) 50vw, 100vw"
               alt={post.title}
               className="w-full h-64 object-cover rounded-lg transition-transform duration-300 group-hover:scale-105"
             />
@@ -70,7 +72,7 @@ export const PostCard = ({ post, showActions = false }: PostCardProps) => {
         <p className="text-muted-foreground whitespace-pre-wrap line-clamp-3 mb-4 leading-relaxed">
           {post.content}
         </p>
-        <ShowPostDialog post={post} />
+        <ShowPostDialog post={post} favoriteId={favoriteId} />
       </CardContent>
     </Card>
   );
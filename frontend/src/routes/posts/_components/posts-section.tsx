@@ -1,6 +1,7 @@
 import { useState, useMemo } from "react";
 import { useGetAllPostsQuery } from "@/services/queries/posts";
 import { useGetTagsQuery } from "@/services/queries/tags";
+import { useFavoriteStatusQuery } from "@/services/queries/favorites";
 import { PostCard } from "./post-card";
 import { PostsMap } from "./posts-map";
 import { CreatePostDialog } from "./create-post-dialog";
@@ -22,6 +23,10 @@ export const PostsSection = () => {
   const { data: posts, isLoading, error } = useGetAllPostsQuery();
   const { data: tags } = useGetTagsQuery();
 
+  // One status lookup for the whole list instead of one request per post
+  const postIds = useMemo(() => posts?.map((post) => post.id) ?? [], [posts]);
+  const { data: favoriteStatus } = useFavoriteStatusQuery(postIds);
+
   const [selectedStatus, setSelectedStatus] = useState<string>("all");
   const [selectedTag, setSelectedTag] = useState<string>("all");
   const [searchQuery, setSearchQuery] = useState<string>("");
@@ -239,7 +244,13 @@ export const PostsSection = () => {
           {/* Posts List */}
           <div className="space-y-6">
             {filteredPosts.map((post) => (
-              <PostCard key={post.id} post={post} />
+              <PostCard
+                key={post.id}
+                post={post}
+                favoriteId={
+                  favoriteStatus ? (favoriteStatus.favorited[post.id] ?? null) : undefined
+                }
+              />
             ))}
           </div>
         </>
@@ -17,9 +17,10 @@ import { FavoriteButton } from "./favorites/favorite-button";
 
 type ShowPostDialogProps = {
   post: Post;
+  favoriteId?: number | null;
 };
 
-export const ShowPostDialog = ({ post }: ShowPostDialogProps) => {
+export const ShowPostDialog = ({ post, favoriteId }: ShowPostDialogProps) => {
   const [open, setOpen] = useState(false);
 
   return (
@@ -53,7 +54,7 @@ export const ShowPostDialog = ({ post }: ShowPostDialogProps) => {
                 </p>
               </div>
             </div>
-            <FavoriteButton postId={post.id} variant="icon" />
+            <FavoriteButton postId={post.id} variant="icon" favoriteId={favoriteId} />
           </div>
 
           <div className="flex items-center gap-2 flex-wrap">
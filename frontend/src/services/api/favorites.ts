@@ -42,6 +42,41 @@ export const checkIfPostIsFavoritedAPI = async (postId: number) => {
   return response.data;
 };
 
+// Post ids the backend accepts in one /favorites/status call
+const FAVORITE_STATUS_BATCH = 500;
+
+export const getFavoriteStatusAPI = async (postIds: number[]) => {
+  const token = useAuthStore.getState().token;
+
+  const batches: number[][] = [];
+  for (let i = 0; i < postIds.length; i += FAVORITE_STATUS_BATCH) {
+    batches.push(postIds.slice(i, i + FAVORITE_STATUS_BATCH));
+  }
+
+  // Each maps favorited post ids to their favorite id; other posts are not favorited
+  const responses = await Promise.all(
+    batches.map((batch) =>
+      axios.post<{ favorited: Record<string, number> }>(
+        `${ENV.API_URL}/favorites/status`,
+        { postIds: batch },
+        {
+          headers: {
+            Authorization: `Bearer ${token}`,
+            "Content-Type": "application/json",
+          },
+        },
+      ),
+    ),
+  );
+
+  return {
+    favorited: Object.assign(
+      {},
+      ...responses.map((response) => response.data.favorited),
+    ) as Record<string, number>,
+  };
+};
+
 export const createFavoriteAPI = async (data: {
   postId: number;
   notes?: string;
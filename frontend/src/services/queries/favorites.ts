@@ -1,5 +1,9 @@
 import { useQuery } from "@tanstack/react-query";
-import { getAllFavoritesAPI, checkIfPostIsFavoritedAPI } from "../api/favorites";
+import {
+  getAllFavoritesAPI,
+  checkIfPostIsFavoritedAPI,
+  getFavoriteStatusAPI,
+} from "../api/favorites";
 
 export const useGetAllFavoritesQuery = () => {
   return useQuery({
@@ -8,10 +12,21 @@ export const useGetAllFavoritesQuery = () => {
   });
 };
 
-export const useCheckIfPostIsFavoritedQuery = (postId: number) => {
+export const useCheckIfPostIsFavoritedQuery = (
+  postId: number,
+  enabled = true,
+) => {
   return useQuery({
     queryKey: ["favorites", "post", postId],
     queryFn: () => checkIfPostIsFavoritedAPI(postId),
-    enabled: !!postId,
+    enabled: !!postId && enabled,
+  });
+};
+
+export const useFavoriteStatusQuery = (postIds: number[]) => {
+  return useQuery({
+    queryKey: ["favorites", "status", postIds],
+    queryFn: () => getFavoriteStatusAPI(postIds),
+    enabled: postIds.length > 0,
   });
 };
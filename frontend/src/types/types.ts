@@ -36,12 +36,16 @@ export type Comment = {
   username: string;
 };
 
+// Resized copies of a post image keyed by width, e.g. { "600": { webp, jpeg } }
+export type ImageVariants = Record<string, { webp?: string; jpeg?: string }>;
+
 export type Post = {
   id: number;
   title: string;
   content: string;
   status: PostStatus;
   image: string | null;
+  imageVariants?: ImageVariants | null;
   latitude: number | null;
   longitude: number | null;
   tagName: string | null;